@@ -1,12 +1,36 @@
 import abc
+import concurrent.futures
+import os
+import warnings
 
 import numpy as np
 import scipy
-import scipy.stats
+
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
+try:
+    import tqdm
+except ImportError:
+    tqdm = None
 
 # project imports
 from . import class_functions, exceptions, gsvd, resample
 
+# approximate number of bytes of resampled copies of X gathered per batch
+# by the batched resampling loops
+_BATCH_BYTES = 1 << 26
+
+# aspect ratio from which the rotate_method 0 permutation test takes its
+# singular values from the Gram matrix instead of an SVD
+_GRAM_ASPECT = 4
+
+# smallest dimension of X for which device="auto" runs the bootstrap on
+# the GPU; below it each SVD is too small to pay for the transfers
+_GPU_MIN_DIM = 512
+
 # import scipy.io as sio
 
 
@@ -51,15 +75,17 @@ class ResampleTest(abc.ABC):
     # instantiate and return valid registered PLS method specified by user
     @classmethod
     def _create(cls, pls_method, *args, **kwargs):
-        if pls_method not in cls._subclasses and pls_method in cls._pls_types:
-            raise exceptions.NotImplementedError(
-                f"Specified PLS/Resample method {cls._pls_types[pls_method]} "
-                "has not yet been implemented."
-            )
-        elif pls_method not in cls._subclasses:
+        ctor = cls._subclasses.get(pls_method)
+        if ctor is None:
+            if pls_method in cls._pls_types:
+                raise exceptions.NotImplementedError(
+                    f"Specified PLS/Resample method "
+                    f"{cls._pls_types[pls_method]} has not yet been "
+                    "implemented."
+                )
             raise ValueError(f"Invalid PLS/Resample method {pls_method}")
         cls.pls_alg = pls_method
-        return cls._subclasses[pls_method](*args, **kwargs)
+        return ctor(*args, **kwargs)
 
 
 @ResampleTest._register_subclass("mct")
@@ -102,6 +128,28 @@ class _ResampleTestTaskPLS(ResampleTest):
     dist : 2-tuple of floats, optional
         Distribution values used for calculating the confidence interval in
         the bootstrap test. Defaults to (0.05, 0.95).
+    n_jobs : int, optional
+        Number of worker processes used to run the permutation and
+        bootstrap iterations. -1 uses all available cores. Defaults to 1
+        (run serially in the calling process).
+    device : str, optional
+        Device used to run the permutation and bootstrap tests: "cpu",
+        "cuda" or "auto". "cuda" requires CuPy and currently supports task
+        PLS with `rotate_method` 0; other cases fall back to the CPU.
+        "auto" picks the GPU only for supported cases where `X` is large
+        enough for the SVDs to dominate. Defaults to "cpu".
+    seed : None, int or np.random.Generator, optional
+        Seed for the random generator used to resample `X`. If None, the
+        generator is seeded from NumPy's global generator, so results are
+        reproducible under ``np.random.seed``. Defaults to None.
+    verbose : boolean, optional
+        Whether to report the tests' progress, with a tqdm progress bar if
+        tqdm is installed. Defaults to True.
+    perm_dtype : np.dtype, optional
+        Floating-point type to run the permutation iterations in when it
+        is narrower than that of `X`, e.g. np.float32. The bootstrap
+        always runs in the precision of `X`. Defaults to None, meaning the
+        precision of `X` is kept.
 
     Attributes
     ----------
@@ -118,7 +166,9 @@ class _ResampleTestTaskPLS(ResampleTest):
     std_errs : np.array
         Element-wise standard errors for the resampled right singular vectors.
     boot_ratios : np.array
-        NumPy array containing element-wise ratios of
+        NumPy array containing element-wise ratios of the observed scaled
+        right singular vectors (`V` * `s`) to their standard errors. Zero
+        where the standard error is zero.
 
     """
 
@@ -137,10 +187,20 @@ class _ResampleTestTaskPLS(ResampleTest):
         dist=(0.05, 0.95),
         rotate_method=0,
         mctype=0,
+        n_jobs=1,
+        device="cpu",
+        seed=None,
+        verbose=True,
+        perm_dtype=None,
     ):
+        if device not in ("cpu", "cuda", "auto"):
+            raise ValueError(f"Invalid device {device}")
         self.dist = dist
+        # one generator drives both tests, so a seed fixes all resamples
+        rng = resample._get_rng(seed)
 
-        print(f"PLS ALG: {self.pls_alg}")
+        if verbose:
+            print(f"PLS ALG: {self.pls_alg}")
         if nperm > 0:
             self.permute_ratio, self.perm_debug_dict = self._permutation_test(
                 X,
@@ -155,6 +215,11 @@ class _ResampleTestTaskPLS(ResampleTest):
                 rotate_method=rotate_method,
                 mctype=mctype,
                 contrast=contrast,
+                n_jobs=n_jobs,
+                device=device,
+                rng=rng,
+                dtype=perm_dtype,
+                verbose=verbose,
             )
 
         if nboot > 0:
@@ -180,6 +245,10 @@ class _ResampleTestTaskPLS(ResampleTest):
                     rotate_method=rotate_method,
                     dist=self.dist,
                     contrast=contrast,
+                    n_jobs=n_jobs,
+                    device=device,
+                    rng=rng,
+                    verbose=verbose,
                 )
             else:
                 (
@@ -201,6 +270,10 @@ class _ResampleTestTaskPLS(ResampleTest):
                     mctype=mctype,
                     dist=self.dist,
                     contrast=contrast,
+                    n_jobs=n_jobs,
+                    device=device,
+                    rng=rng,
+                    verbose=verbose,
                 )
 
     @staticmethod
@@ -218,10 +291,19 @@ class _ResampleTestTaskPLS(ResampleTest):
         rotate_method=0,
         mctype=0,
         threshold=1e-12,
+        n_jobs=1,
+        device="cpu",
+        rng=None,
+        dtype=None,
+        verbose=True,
     ):
         """Run permutation test on X. Resamples X (without replacement) based
         on condition order, runs PLS on resampled matrix, and computes the
         element-wise permutation ratio ((number of times permutation > observation)/`niter`.
+
+        Only the ordering of the permuted singular values against `s` is
+        used, so the iterations can run in a narrower `dtype` (e.g.
+        np.float32) than that of `X`. Defaults to the precision of `X`.
         """
         # if ngroups > 1:
         #     raise exceptions.NotImplementedError(
@@ -229,134 +311,63 @@ class _ResampleTestTaskPLS(ResampleTest):
         #     )
 
         # singvals = np.empty((s.shape[0], niter))
-        greatersum = np.zeros(s.shape)
         s[np.abs(s) < threshold] = 0
         debug = True
         debug_dict = {}
-        indices = np.empty((niter, X.shape[0]))
-        if debug:
-            sum_perm = np.empty(niter)
-            sum_s = np.empty(niter)
-            s_list = np.empty((niter, s.shape[0]))
-
-        print("----Running Permutation Test----\n")
-        for i in range(niter):
-            if (i + 1) % 50 == 0:
-                print(f"Iteration {i + 1}")
-            # create resampled X matrix and get resampled indices
-
-            X_new, inds = resample.resample_without_replacement(
-                X, cond_order, return_indices=True
-            )
-            indices[i] = inds
-
-            if Y is not None:
-                Y_new = Y[inds, :]
-                # Y_new = resample.resample_without_replacement(Y, cond_order)
-
-            # pass in preprocessing function (i.e. mean-centering) for use
-            # after sampling
-
-            if Y is None:
-                permuted = preprocess(
-                    X_new, cond_order, mctype=mctype, return_means=False
-                )
 
-            else:
-                permuted = preprocess(X_new, Y_new, cond_order)
-
-            if debug:
-                sum_perm[i] = np.sum(np.power(permuted, 2))
-
-            # print(f"permuted shape: {permuted.shape}")
-
-            if rotate_method == 0:
-                # run GSVD on mean-centered, resampled matrix
-                # U_hat, s_hat, V_hat = gsvd.gsvd(permuted)
-
-                # s_hat = gsvd.gsvd(permuted, compute_uv=False)
-                if contrast is None:
-                    s_hat = np.linalg.svd(permuted, compute_uv=False)
-                    # print(f"s_hat shape: {s_hat.shape}\n")
-                else:
-                    inpt = contrast.T @ permuted
-                    # s_hat = np.linalg.svd(contrast.T @ permuted, compute_uv=False)
-                    s_hat = np.linalg.svd(inpt, compute_uv=False)
-                # print(s_hat)
-            elif rotate_method == 1:
-                # U_hat, s_hat, V_hat = gsvd.gsvd(permuted)
-                if contrast is not None:
-                    U_hat, s_hat, V_hat = class_functions._run_pls_contrast(
-                        permuted, contrast
-                    )
-                else:
-                    U_hat, s_hat, V_hat = np.linalg.svd(
-                        permuted, full_matrices=False
-                    )
-                    V_hat = V_hat.T
-                # procustes
-                # U_bar, s_bar, V_bar = gsvd.gsvd(V.T @ V_hat)
-                # U_bar, s_bar, V_bar = np.linalg.svd(V.T @ V_hat, full_matrices=False)
-                U_bar, s_bar, V_bar = np.linalg.svd(
-                    U.T @ U_hat, full_matrices=False
-                )
-                V_bar = V_bar.T
-                # print(X_new_mc.shape)
-                rot = V_bar @ U_bar.T
-                U_rot = (U_hat * s_hat) @ rot
-                # permuted_rot = permuted @ V_rot
-                # permuted_rot = U_rot.T @ permuted
-                # s_rot = np.sqrt(np.sum(np.power(permuted_rot.T, 2), axis=0))
-                s_rot = np.sqrt(np.sum(np.power(U_rot, 2), axis=0))
-                s_hat = np.copy(s_rot)
-                # print(s_hat)
-            elif rotate_method == 2:
-                # use derivation equations to compute permuted singular values
-                if pls_alg in ["cst", "csb", "cmb"]:
-                    s_hat = class_functions._run_pls_contrast(
-                        permuted, contrast, compute_uv=False
-                    )
-                else:
-                    US_hat = permuted.T @ U
-                    s_hat = np.sqrt(np.sum(np.power(US_hat, 2), axis=0))
-
-                # U_hat_, s_hat_, V_hat_ = gsvd.gsvd(X_new_mc)
-
-                # gd = [float("{:.5f}".format(i)) for i in s_hat_]
-                # der = [float("{:.5f}".format(i)) for i in s_hat]
-
-                # print(f"GSVD: {gd}")
-                # print(f"Derived: {der}")
-
-                # U_hat = US_hat / s_hat
-                # V_hat = np.linalg.inv(np.diag(s_hat)) @ (U.T @ X_new_mc)
-                # print(s_hat)
-            else:
-                raise exceptions.NotImplementedError(
-                    f"Specified rotation method ({rotate_method}) "
-                    "has not been implemented."
-                )
-
-            # insert s_hat into singvals tracking matrix
-            # singvals[:, i] = s_hat
-            # count number of times sampled singular values are
-            # greater than observed singular values, element-wise
-            # greatersum += s >= s_hat
-            # print(s_hat >= s)
-            s_hat[np.abs(s_hat) < threshold] = 0
-            # greatersum += s_hat >= np.mean(s)
-            greatersum += s_hat >= s
-            if debug:
-                s_list[
-                    i:,
-                ] = s_hat
-                sum_s[i] = np.sum(np.power(s_hat, 2))
+        s_obs = s
+        if dtype is not None and np.dtype(dtype).itemsize < X.dtype.itemsize:
+            X, Y, U, V, contrast = (
+                None if a is None else a.astype(dtype)
+                for a in (X, Y, U, V, contrast)
+            )
+            # compare against s at the precision the iterations run in
+            s_obs = s.astype(dtype)
+
+        iter_fn = _permutation_iters
+        if rotate_method == 2 and Y is None and mctype in (0, 1):
+            # centring reduces X to group/condition rows, so run the
+            # iterations in batches
+            iter_fn = _permutation_iters_derived
+        elif _use_gpu(device, X, Y, rotate_method, mctype):
+            # the GPU batches iterations itself; don't split across workers
+            iter_fn = _permutation_iters_gpu
+            n_jobs = 1
+
+        if verbose:
+            print("----Running Permutation Test----\n")
+        s_list, sum_perm, indices = _run_iters(
+            iter_fn,
+            niter,
+            n_jobs,
+            resample._get_rng(rng),
+            X,
+            Y,
+            U,
+            s,
+            V,
+            cond_order,
+            pls_alg,
+            preprocess,
+            contrast,
+            rotate_method,
+            mctype,
+            threshold,
+            verbose,
+        )
 
+        # count number of times sampled singular values are
+        # greater than observed singular values, element-wise
+        # greatersum += s >= s_hat
+        # greatersum += s_hat >= np.mean(s)
+        greatersum = np.sum(s_list >= s_obs, axis=0)
         permute_ratio = greatersum / niter
 
-        print(f"real s: {s}")
-        print(f"ratio: {permute_ratio}")
+        if verbose:
+            print(f"real s: {s}")
+            print(f"ratio: {permute_ratio}")
         if debug:
+            sum_s = np.einsum("ij,ij->i", s_list, s_list)
             debug_dict["s_list"] = s_list
             debug_dict["sum_s"] = sum_perm
             debug_dict["sum_perm"] = sum_s
@@ -380,6 +391,10 @@ class _ResampleTestTaskPLS(ResampleTest):
         mctype=0,
         dist=(0.05, 0.95),
         contrast=None,
+        n_jobs=1,
+        device="cpu",
+        rng=None,
+        verbose=True,
     ):
         """Runs a bootstrap estimation on X matrix. Resamples X with
         replacement according to the condition order, runs PLS on the
@@ -389,154 +404,37 @@ class _ResampleTestTaskPLS(ResampleTest):
         debug = True
         debug_dict = {}
 
-        # allocate memory for sampled values
-        # left_sv_sampled = np.empty((niter, U.shape[0], U.shape[1]))
-        left_sv_sampled = np.empty((niter, X.shape[0], U.shape[1]))
-        right_sv_sampled = np.empty((niter, V.shape[0], V.shape[1]))
-        indices = np.empty((niter, X.shape[0]))
-
         # m_inds = sio.loadmat("/home/nfrazier-logue/matlab/samps.mat")["x"].T - 1
         # print(f"MATLAB SHAPE: {m_inds.shape}")
 
-        if Y is not None:
-            # LVcorr = np.empty((niter, Y.shape[0], V.shape[1]))
-            # change LVcorr column dimension if using multi-block
-            ncols = np.product(cond_order.shape) * Y.shape[1]
-            if pls_alg in ["mb", "cmb"]:
-                ncols = X.shape[1]
-
-            LVcorr = np.empty(
-                (
-                    niter,
-                    np.product(cond_order.shape) * Y.shape[1],
-                    # np.product(cond_order.shape) * Y.shape[1],
-                    ncols,
-                )
-            )
-
-        # right_sum = np.zeros(X.shape[1], X.shape[1])
-        # right_squares = np.zeros(X.shape[1], X.shape[1])
-        print("----Running Bootstrap Test----\n")
-        for i in range(niter):
-            # print out iteration number every 50 iterations
-            if (i + 1) % 50 == 0:
-                print(f"Iteration {i + 1}")
-
-            # also return indices to use with Y_new
-            X_new, inds = resample.resample_with_replacement(
-                X, cond_order, return_indices=True
-            )
-
-            # X_new = X[m_inds[i], :]
-
-            indices[i] = inds
-            # indices[i] = m_inds[i]
-
-            if Y is not None:
-                Y_new = Y[inds, :]
-                # Y_new = Y[m_inds[i], :]
-
-            # pass in preprocessing function (e.g. mean-centering) for use
-            # after sampling
-
-            if Y is None:
-                permuted = preprocess(
-                    X_new, cond_order, mctype=mctype, return_means=False
-                )
-
-            else:
-                permuted = preprocess(X_new, Y_new, cond_order)
-
-            # if Y is None:
-            #     X_new_means, X_new_mc = preprocess(
-            #         X_new, cond_order=cond_order
-            #     )  # , ngroups=ngroups)
-
-            if rotate_method == 0:
-                # run GSVD on mean-centered, resampled matrix
-
-                # U_hat, s_hat, V_hat = gsvd.gsvd(permuted)
-                U_hat, s_hat, V_hat = np.linalg.svd(
-                    permuted, full_matrices=False
-                )
-                V_hat = V_hat.T
-            elif rotate_method == 1:
-                # U_hat, s_hat, V_hat = gsvd.gsvd(permuted)
-                U_hat, s_hat, V_hat = np.linalg.svd(
-                    permuted, full_matrices=False
-                )
-                V_hat = V_hat.T
-                # procustes
-                # U_bar, s_bar, V_bar = gsvd.gsvd(V.T @ V_hat)
-                # U_bar, s_bar, V_bar = np.linalg.svd(V.T @ V_hat, full_matrices=False)
-                U_bar, s_bar, V_bar = np.linalg.svd(
-                    U.T @ U_hat, full_matrices=False
-                )
-                # s_pro = np.sqrt(np.sum(np.power(V_bar, 2), axis=0))
-                # print(X_new_mc.shape)
-                # rot = U_bar @ V.T
-                # V_rot = V_hat.T @ rot.T
-
-                rot = V_bar @ U_bar.T
-                U_rot = (U_hat * s_hat) @ rot
-                # permuted_rot = permuted @ V_rot
-                permuted_rot = U_rot @ permuted
-                s_rot = np.sqrt(np.sum(np.power(permuted_rot.T, 2), axis=0))
-                s_hat = np.copy(s_rot)
-
-            elif rotate_method == 2:
-                # use derivation equations to compute permuted singular values
-                # US_hat = X_new_mc @ V
-                VS_hat = permuted.T @ U
-                s_hat = np.sqrt(np.sum(np.power(VS_hat, 2), axis=0))
-                # US_hat = V.T @ permuted.T
-                # s_hat = np.sqrt(np.sum(np.power(US_hat, 2), axis=0))
-                V_hat_der = VS_hat / s_hat
-                U_hat = (
-                    np.linalg.inv(np.diag(s_hat)) @ (V_hat_der.T @ permuted.T)
-                ).T
-                # V_hat = (X_new_mc.T @ U_hat_der) / s_hat
-                # potential fix for sign issues
-                V_hat = V_hat_der
-                # U_hat = (X_new_mc @ V_hat) / s_hat
-                # U_hat_, s_hat_, V_hat_ = gsvd.gsvd(X_new_mc)
-
-                # print("DERIVED\n")
-                # print(U_hat_der)
-                # print("=====================")
-                # print("DOUBLE DERIVED\n")
-                # print(s_hat)
-                # print("----------------------")
-                # print(s_hat_)
-                # print("++++++++++++++++++++++")
-            else:
-                raise exceptions.NotImplementedError(
-                    f"Specified rotation method ({rotate_method}) "
-                    "has not been implemented."
-                )
-
-            # insert left singular vector into tracking np.array
-            # print(f"dst: {right_sv_sampled[i].shape}; src: {V_hat.shape}")
-            # left_sv_sampled[i] = U_hat * s_hat
-            left_sv_sampled[i] = class_functions._compute_X_latents(
-                X_new, V_hat
-            )
-            right_sv_sampled[i] = V_hat * s_hat
-            if Y is not None:
-                # compute X latents for use in correlation computation
-                X_hat_latent = class_functions._compute_X_latents(X_new, V_hat)
-                # print(f"XHL shape: {X_hat_latent.shape}")
-                # print(f"U shape: {U.shape}")
-                # print(f"V shape: {V.shape}")
-                # print(f"U_hat shape: {U_hat.shape}")
-                # print(f"V_hat shape: {V_hat.shape}")
-                LVcorr[i] = class_functions._compute_corr(
-                    X_hat_latent, Y_new, cond_order
-                )
-                # LVcorr[:, 1:] = LVcorr[:, 1:] * -1  # temp sign change fix
-                # LVcorr[:, 0] = np.abs(LVcorr[:, 0])
-            # right_sum += V_hat
-            # right_squares += np.power(V_hat, 2)
+        iter_fn = _bootstrap_iters
+        if _use_gpu(device, X, Y, rotate_method, mctype):
+            # the GPU batches iterations itself; don't split across workers
+            iter_fn = _bootstrap_iters_gpu
+            n_jobs = 1
+        elif rotate_method == 2 and Y is None and mctype in (0, 1):
+            # as in the permutation test, run the iterations in batches
+            iter_fn = _bootstrap_iters_derived
+
+        if verbose:
+            print("----Running Bootstrap Test----\n")
+        left_sv_sampled, right_sum, right_sq, LVcorr, indices = _run_iters(
+            iter_fn,
+            niter,
+            n_jobs,
+            resample._get_rng(rng),
+            X,
+            Y,
+            U,
+            s,
+            V,
+            cond_order,
+            pls_alg,
+            preprocess,
+            rotate_method,
+            mctype,
+            verbose,
+        )
 
         # compute confidence intervals of U sampled
 
@@ -549,15 +447,20 @@ class _ResampleTestTaskPLS(ResampleTest):
         )
 
         # compute standard error of left singular vector
-        std_errs = scipy.stats.sem(right_sv_sampled, axis=0)
-        # compute bootstrap ratios
-        boot_ratios = np.divide(std_errs, V)
+        # (from the per-worker running sums of the right singular vectors)
+        std_errs = _sem_from_sums(
+            np.sum(right_sum, axis=0), np.sum(right_sq, axis=0), niter
+        )
+        # compute bootstrap ratios of the observed saliences, scaled as
+        # the resampled ones the standard errors come from; leave zeros
+        # where the standard error is zero instead of infs/NaNs
+        boot_ratios = np.zeros_like(std_errs)
+        np.divide(V * s, std_errs, out=boot_ratios, where=std_errs > 0)
         # TODO: find more elegant solution to returning arbitrary # of vals
         # maybe tokenizing a dictionary?
 
         if debug:
             debug_dict["left_sv_sampled"] = left_sv_sampled
-            debug_dict["right_sv_sampled"] = right_sv_sampled
             debug_dict["left_grand_mean"] = left_grand_mean
             debug_dict["indices"] = indices
 
@@ -576,37 +479,772 @@ class _ResampleTestTaskPLS(ResampleTest):
             )
 
     def __repr__(self):
-        stg = ""
-        stg += "Permutation Test Results\n"
-        stg += "------------------------\n\n"
-        stg += f"Ratio: {self.permute_ratio}\n\n"
-        stg += "Bootstrap Test Results\n"
-        stg += "----------------------\n\n"
-        stg += f"Element-wise Confidence Interval: {self.dist}\n"
-        stg += "\nLower CI: \n"
-        stg += str(self.conf_ints[0])
-        stg += "\n\nUpper CI: \n"
-        stg += str(self.conf_ints[1])
-        stg += "\n\nStandard Errors:\n"
-        stg += str(self.std_errs)
-        stg += "\n\nBootstrap Ratios:\n"
-        stg += str(self.boot_ratios)
-        return stg
+        stg = [
+            "Permutation Test Results\n",
+            "------------------------\n\n",
+            f"Ratio: {self.permute_ratio}\n\n",
+            "Bootstrap Test Results\n",
+            "----------------------\n\n",
+            f"Element-wise Confidence Interval: {self.dist}\n",
+            "\nLower CI: \n",
+            str(self.conf_ints[0]),
+            "\n\nUpper CI: \n",
+            str(self.conf_ints[1]),
+            "\n\nStandard Errors:\n",
+            str(self.std_errs),
+            "\n\nBootstrap Ratios:\n",
+            str(self.boot_ratios),
+        ]
+        return "".join(stg)
+
+    __str__ = __repr__
+
+
+def _run_iters(iter_fn, niter, n_jobs, rng, *args):
+    """Runs `niter` resampling iterations of `iter_fn`, optionally split
+    across `n_jobs` worker processes.
+
+    `iter_fn` is called as ``iter_fn(niter, rng, *args)`` and must return
+    a tuple of per-iteration arrays (stacked along axis 0) or None. When
+    run in parallel, each worker gets an even share of the iterations and
+    a generator built from its own child of a `np.random.SeedSequence`,
+    whose entropy is drawn from `rng`. Workers' streams are therefore
+    independent of each other and results stay reproducible for a given
+    `rng` seed. The partial results are concatenated in worker order.
 
-    def __str__(self):
-        stg = ""
-        stg += "Permutation Test Results\n"
-        stg += "------------------------\n\n"
-        stg += f"Ratio: {self.permute_ratio}\n\n"
-        stg += "Bootstrap Test Results\n"
-        stg += "----------------------\n\n"
-        stg += f"Element-wise Confidence Interval: {self.dist}\n"
-        stg += "\nLower CI: \n"
-        stg += str(self.conf_ints[0])
-        stg += "\n\nUpper CI: \n"
-        stg += str(self.conf_ints[1])
-        stg += "\n\nStandard Errors:\n"
-        stg += str(self.std_errs)
-        stg += "\n\nBootstrap Ratios:\n"
-        stg += str(self.boot_ratios)
-        return stg
+    Parameters
+    ----------
+    iter_fn : function
+        Module-level resampling function (e.g. `_permutation_iters`).
+    niter : int
+        Total number of iterations to run.
+    n_jobs : int
+        Number of worker processes. 1 runs serially in the calling
+        process; -1 uses all available cores.
+    rng : np.random.Generator
+        Random generator the resampled indices are drawn from.
+    *args
+        Remaining positional arguments passed to `iter_fn`.
+
+    Returns
+    -------
+    results : tuple
+        Per-iteration results of `iter_fn` for all `niter` iterations.
+    """
+    if n_jobs is None or n_jobs == 0:
+        raise ValueError(f"Invalid number of jobs {n_jobs}")
+    if n_jobs < 0:
+        n_jobs = max(os.cpu_count() + 1 + n_jobs, 1)
+    n_jobs = min(n_jobs, niter)
+    if n_jobs == 1:
+        return iter_fn(niter, rng, *args)
+
+    chunks = [niter // n_jobs + (i < niter % n_jobs) for i in range(n_jobs)]
+    entropy = rng.integers(np.iinfo(np.int64).max)
+    seeds = np.random.SeedSequence(entropy).spawn(n_jobs)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        futures = [
+            pool.submit(iter_fn, chunk, np.random.default_rng(seed), *args)
+            for seed, chunk in zip(seeds, chunks)
+        ]
+        results = [future.result() for future in futures]
+
+    return tuple(
+        None if parts[0] is None else np.concatenate(parts)
+        for parts in zip(*results)
+    )
+
+
+def _progress(niter, verbose, step=1):
+    """Iterates over the starts of consecutive blocks of `step` out of
+    `niter` iterations, reporting progress if `verbose` is True: with a
+    tqdm progress bar when tqdm is installed, otherwise by printing the
+    iteration count every 50 iterations (or after every block).
+    """
+    starts = range(0, niter, step)
+    if not verbose:
+        yield from starts
+    elif tqdm is not None:
+        with tqdm.tqdm(total=niter) as bar:
+            for start in starts:
+                yield start
+                bar.update(min(step, niter - start))
+    else:
+        for start in starts:
+            stop = min(start + step, niter)
+            if step > 1 or stop % 50 == 0:
+                print(f"Iteration {stop}")
+            yield start
+
+
+def _permutation_iters(
+    niter,
+    rng,
+    X,
+    Y,
+    U,
+    s,
+    V,
+    cond_order,
+    pls_alg,
+    preprocess,
+    contrast,
+    rotate_method,
+    mctype,
+    threshold,
+    verbose=True,
+):
+    """Runs `niter` iterations of the permutation test. See
+    `_ResampleTestTaskPLS._permutation_test`.
+
+    Returns
+    -------
+    s_list : np.array
+        Resampled singular values of each iteration.
+    sum_perm : np.array
+        Sum of squares of each preprocessed, resampled matrix.
+    indices : np.array
+        Resampled row indices of each iteration.
+    """
+    s_list = np.empty((niter, s.shape[0]))
+    sum_perm = np.empty(niter)
+    # draw every iteration's resampled row indices up front
+    indices = resample.resample_without_replacement_indices(
+        X.shape[0], cond_order, niter, rng=rng
+    )
+    # pick the preprocess call and rotation once instead of branching
+    # on them every iteration
+    resample_prep = _make_resample_and_preprocess(
+        X, Y, cond_order, preprocess, mctype
+    )
+    perm_body = _make_permutation_body(
+        X, Y, U, pls_alg, contrast, rotate_method
+    )
+
+    for i in _progress(niter, verbose):
+        # resample X (and Y) with this iteration's indices and pass them
+        # through the preprocessing function (i.e. mean-centering)
+        _, _, permuted = resample_prep(indices[i])
+
+        # squared Frobenius norm in one pass, without a squared temporary
+        sum_perm[i] = np.vdot(permuted, permuted)
+
+        s_hat = perm_body(permuted)
+
+        # insert s_hat into singvals tracking matrix
+        s_hat[np.abs(s_hat) < threshold] = 0
+        s_list[i] = s_hat
+
+    return (s_list, sum_perm, indices)
+
+
+def _permutation_iters_derived(
+    niter,
+    rng,
+    X,
+    Y,
+    U,
+    s,
+    V,
+    cond_order,
+    pls_alg,
+    preprocess,
+    contrast,
+    rotate_method,
+    mctype,
+    threshold,
+    verbose=True,
+):
+    """Batched version of `_permutation_iters` for task PLS with
+    `rotate_method` 2 and group/condition mean-centring (mctype 0 or 1).
+
+    That centring is a fixed linear map of the rows of `X`, so it is built
+    once from `cond_order` and folded into the projection. Permuting the rows of `X` is the same as permuting the
+    columns of that map, so each batch of iterations is a single matmul
+    with `X` itself, without gathering or centring permuted copies of it.
+    Returns the same values as `_permutation_iters`.
+    """
+    indices = resample.resample_without_replacement_indices(
+        X.shape[0], cond_order, niter, rng=rng
+    )
+    P = class_functions._mean_centre_map(cond_order, mctype, dtype=X.dtype)
+    # permuted singular values are the norms of the permuted data
+    # projected onto the contrasts or the observed left singular vectors
+    if pls_alg in ["cst", "csb", "cmb"]:
+        Wt = contrast.T
+    else:
+        Wt = U.T
+
+    s_list = np.empty((niter, s.shape[0]))
+    sum_perm = np.empty(niter)
+
+    # rows projecting X onto Wt after centring; an orthogonal Wt keeps the
+    # norm of the centred matrix, otherwise the centring rows are stacked
+    # below to get it
+    nlv = Wt.shape[0]
+    orthogonal = contrast is None and U.shape[0] == U.shape[1]
+    proj = Wt @ P if orthogonal else np.vstack((Wt @ P, P))
+    norm_rows = slice(0 if orthogonal else nlv, None)
+    # row i of X lands in column inverse[i] of each permuted matrix
+    inverse = np.argsort(indices, axis=1)
+
+    nrows = proj.shape[0]
+    row_bytes = nrows * X.shape[1] * X.itemsize
+    batch_size = int(max(1, min(niter, _BATCH_BYTES // row_bytes)))
+    for start in _progress(niter, verbose, batch_size):
+        stop = min(start + batch_size, niter)
+
+        # (batch * rows, X rows) stack of permuted projections, applied
+        # to X in one matmul
+        coefs = proj[:, inverse[start:stop]].transpose(1, 0, 2)
+        projected = (coefs.reshape(-1, X.shape[0]) @ X).reshape(
+            stop - start, nrows, -1
+        )
+        sq = np.einsum("brn,brn->br", projected, projected)
+        s_list[start:stop] = np.sqrt(sq[:, :nlv])
+        sum_perm[start:stop] = np.sum(sq[:, norm_rows], axis=1)
+
+    s_list[np.abs(s_list) < threshold] = 0
+    return (s_list, sum_perm, indices)
+
+
+def _bootstrap_iters(
+    niter,
+    rng,
+    X,
+    Y,
+    U,
+    s,
+    V,
+    cond_order,
+    pls_alg,
+    preprocess,
+    rotate_method,
+    mctype,
+    verbose=True,
+):
+    """Runs `niter` iterations of the bootstrap test. See
+    `_ResampleTestTaskPLS._bootstrap_test`.
+
+    Returns
+    -------
+    left_sv_sampled : np.array
+        X latents of each resampled matrix.
+    right_sum : np.array
+        Sum over iterations of the scaled right singular vectors of each
+        resampled matrix, less `V` * `s`, with a leading axis of length 1.
+    right_sq : np.array
+        Matching sum of squares, shaped like `right_sum`.
+    LVcorr : np.array or None
+        Latent variable correlations of each iteration. None if `Y` is None.
+    indices : np.array
+        Resampled row indices of each iteration.
+    """
+    # allocate memory for sampled values
+    # left_sv_sampled = np.empty((niter, U.shape[0], U.shape[1]))
+    left_sv_sampled = np.empty((niter, X.shape[0], U.shape[1]))
+    # only the standard error of the scaled right singular vectors is
+    # needed, so keep running sums instead of every iteration's values;
+    # they are taken about the observed V * s to limit cancellation
+    right_shift = V * s
+    right_sum = np.zeros(V.shape)
+    right_sq = np.zeros(V.shape)
+    # draw resampled indices for every iteration at once
+    indices = resample.resample_with_replacement_indices(
+        X.shape[0], cond_order, niter, rng=rng
+    )
+
+    # m_inds = sio.loadmat("/home/nfrazier-logue/matlab/samps.mat")["x"].T - 1
+    # print(f"MATLAB SHAPE: {m_inds.shape}")
+
+    if Y is not None:
+        # LVcorr = np.empty((niter, Y.shape[0], V.shape[1]))
+        # change LVcorr column dimension if using multi-block
+        ncols = np.product(cond_order.shape) * Y.shape[1]
+        if pls_alg in ["mb", "cmb"]:
+            ncols = X.shape[1]
+
+        LVcorr = np.empty(
+            (
+                niter,
+                np.product(cond_order.shape) * Y.shape[1],
+                # np.product(cond_order.shape) * Y.shape[1],
+                ncols,
+            )
+        )
+    else:
+        LVcorr = None
+
+    # pick the preprocess call and rotation once instead of branching
+    # on them every iteration
+    resample_prep = _make_resample_and_preprocess(
+        X, Y, cond_order, preprocess, mctype
+    )
+    boot_body = _make_bootstrap_body(X, Y, U, rotate_method)
+    compute_X_latents = class_functions._compute_X_latents
+
+    for i in _progress(niter, verbose):
+        # resample X (and Y) with this iteration's indices and pass them
+        # through the preprocessing function (e.g. mean-centering)
+        X_new, Y_new, permuted = resample_prep(indices[i])
+        # X_new = X[m_inds[i], :]
+        # indices[i] = m_inds[i]
+
+        V_hat, s_hat = boot_body(permuted)
+
+        # insert left singular vector into tracking np.array
+        # left_sv_sampled[i] = U_hat * s_hat
+        # write X latents straight into the tracking array
+        compute_X_latents(X_new, V_hat, out=left_sv_sampled[i])
+        right_dev = V_hat * s_hat - right_shift
+        right_sum += right_dev
+        right_sq += right_dev * right_dev
+        if Y is not None:
+            # reuse X latents for use in correlation computation
+            X_hat_latent = left_sv_sampled[i]
+            # print(f"XHL shape: {X_hat_latent.shape}")
+            # print(f"U shape: {U.shape}")
+            # print(f"V shape: {V.shape}")
+            # print(f"U_hat shape: {U_hat.shape}")
+            # print(f"V_hat shape: {V_hat.shape}")
+            LVcorr[i] = class_functions._compute_corr(
+                X_hat_latent, Y_new, cond_order
+            )
+            # LVcorr[:, 1:] = LVcorr[:, 1:] * -1  # temp sign change fix
+            # LVcorr[:, 0] = np.abs(LVcorr[:, 0])
+
+    return (
+        left_sv_sampled,
+        right_sum[np.newaxis],
+        right_sq[np.newaxis],
+        LVcorr,
+        indices,
+    )
+
+
+def _bootstrap_iters_derived(
+    niter,
+    rng,
+    X,
+    Y,
+    U,
+    s,
+    V,
+    cond_order,
+    pls_alg,
+    preprocess,
+    rotate_method,
+    mctype,
+    verbose=True,
+):
+    """Batched version of `_bootstrap_iters` for task PLS with
+    `rotate_method` 2 and group/condition mean-centring (mctype 0 or 1).
+
+    The centring map is folded into the projection onto `U` once, as
+    `W`. For a resampled `X_new`, ``X_new.T @ W`` is ``X.T @ A`` where `A`
+    adds up the rows of `W` each row of `X` was drawn into, and the X
+    latents ``X_new @ V_hat`` are rows of ``X @ V_hat``. Each batch of
+    iterations is then two matmuls with `X` itself, rather than gathering,
+    centring and projecting a resampled copy of `X` per iteration.
+    Returns the same values as `_bootstrap_iters`.
+    """
+    indices = resample.resample_with_replacement_indices(
+        X.shape[0], cond_order, niter, rng=rng
+    )
+    P = class_functions._mean_centre_map(cond_order, mctype, dtype=X.dtype)
+    W = P.T @ U
+    nrows, nlv = W.shape
+    ncols = X.shape[1]
+
+    left_sv_sampled = np.empty((niter, nrows, nlv))
+    # running sums about V * s, as in _bootstrap_iters
+    right_shift = (V * s)[:, np.newaxis, :]
+    right_sum = np.zeros(V.shape)
+    right_sq = np.zeros(V.shape)
+
+    # the batch's matrices are kept side by side along their middle axis,
+    # e.g. (cols, batch, lvs), so each one feeds a single 2-d matmul
+    iter_bytes = (3 * ncols + 2 * nrows) * nlv * X.itemsize
+    batch_size = int(max(1, min(niter, _BATCH_BYTES // iter_bytes)))
+    for start in _progress(niter, verbose, batch_size):
+        stop = min(start + batch_size, niter)
+        inds = indices[start:stop]
+        batch = np.arange(stop - start)[:, np.newaxis]
+
+        A = np.zeros((nrows, stop - start, nlv))
+        np.add.at(A, (inds, batch), W)
+        # scaled right singular vectors and singular values of the batch
+        VS_hat = (X.T @ A.reshape(nrows, -1)).reshape(ncols, -1, nlv)
+        s_hat = np.sqrt(np.einsum("nbk,nbk->bk", VS_hat, VS_hat))
+        V_hat = VS_hat / s_hat
+
+        latents = (X @ V_hat.reshape(ncols, -1)).reshape(nrows, -1, nlv)
+        left_sv_sampled[start:stop] = latents[inds, batch]
+        right_dev = VS_hat - right_shift
+        right_sum += right_dev.sum(axis=1)
+        right_sq += np.einsum("nbk,nbk->nk", right_dev, right_dev)
+
+    return (
+        left_sv_sampled,
+        right_sum[np.newaxis],
+        right_sq[np.newaxis],
+        None,
+        indices,
+    )
+
+
+def _make_resample_and_preprocess(X, Y, cond_order, preprocess, mctype):
+    """Returns the function shared by the permutation and bootstrap loops
+    that takes one iteration's resampled row indices, gathers those rows
+    of `X` (and `Y`) and preprocesses them, returning
+    ``(X_new, Y_new, permuted)``. `Y_new` is None when `Y` is None.
+
+    The resampled copies of `X` and `Y` are written into buffers reused
+    by every iteration, as is the task PLS preprocess output when it has
+    the shape of `X` (mctype 2), so callers must not keep them across
+    iterations.
+    """
+    X_new = np.empty_like(X)
+    take = np.take
+
+    if Y is None:
+        mc_kwargs = {"out": np.empty_like(X)} if mctype == 2 else {}
+
+        def resample_prep(inds):
+            take(X, inds, axis=0, out=X_new)
+            permuted = preprocess(
+                X_new,
+                cond_order,
+                mctype=mctype,
+                return_means=False,
+                **mc_kwargs,
+            )
+            return (X_new, None, permuted)
+
+    else:
+        Y_new = np.empty_like(Y)
+
+        def resample_prep(inds):
+            take(X, inds, axis=0, out=X_new)
+            take(Y, inds, axis=0, out=Y_new)
+            return (X_new, Y_new, preprocess(X_new, Y_new, cond_order))
+
+    return resample_prep
+
+
+def _make_permutation_body(X, Y, U, pls_alg, contrast, rotate_method):
+    """Returns the function computing one permutation iteration's singular
+    values from its preprocessed matrix under `rotate_method`, chosen once
+    before the loop.
+    """
+    # look up the LAPACK SVD routine once for every iteration
+    gesdd = class_functions._bind_gesdd(*(a for a in (X, Y) if a is not None))
+    # transpose of U used by the rotations, made contiguous once
+    Ut = np.ascontiguousarray(U.T)
+
+    if rotate_method == 0:
+
+        def singular_values(M):
+            # only the singular values are compared, so for matrices far
+            # from square take them from the small Gram matrix; otherwise
+            # run SVD on M, which is not used again, so LAPACK may
+            # overwrite it
+            if max(M.shape) >= _GRAM_ASPECT * min(M.shape):
+                return class_functions._gram_singular_values(M)
+            return class_functions._run_gesdd(
+                gesdd, M, compute_uv=False, overwrite_a=True
+            )
+
+        if contrast is None:
+            perm_body = singular_values
+        else:
+
+            def perm_body(permuted):
+                return singular_values(contrast.T @ permuted)
+
+    elif rotate_method == 1:
+
+        def perm_body(permuted):
+            if contrast is not None:
+                U_hat, s_hat, V_hat = class_functions._run_pls_contrast(
+                    permuted, contrast
+                )
+            elif permuted.shape[0] <= permuted.shape[1]:
+                # the rotation only needs U_hat and s_hat, which come from
+                # the eigendecomposition of the small rows x rows Gram
+                # matrix without an SVD of the full permuted matrix
+                w, U_hat = np.linalg.eigh(permuted @ permuted.T)
+                U_hat = U_hat[:, ::-1]
+                s_hat = np.sqrt(np.clip(w[::-1], 0, None))
+            else:
+                U_hat, s_hat, V_hat = class_functions._run_gesdd(
+                    gesdd, permuted
+                )
+            # procustes
+            U_bar, s_bar, V_bar = class_functions._run_gesdd(
+                gesdd, Ut @ U_hat, overwrite_a=True
+            )
+            rot = V_bar @ U_bar.T
+            U_rot = (U_hat * s_hat) @ rot
+            return np.sqrt(np.einsum("ij,ij->j", U_rot, U_rot))
+
+    elif rotate_method == 2:
+        # use derivation equations to compute permuted singular values
+        if pls_alg in ["cst", "csb", "cmb"]:
+
+            def perm_body(permuted):
+                return class_functions._run_pls_contrast(
+                    permuted, contrast, compute_uv=False
+                )
+
+        else:
+
+            def perm_body(permuted):
+                US_hat = Ut @ permuted
+                return np.sqrt(np.einsum("ij,ij->i", US_hat, US_hat))
+
+    else:
+        raise exceptions.NotImplementedError(
+            f"Specified rotation method ({rotate_method}) "
+            "has not been implemented."
+        )
+    return perm_body
+
+
+def _make_bootstrap_body(X, Y, U, rotate_method):
+    """Returns the function computing one bootstrap iteration's right
+    singular vectors and singular values, as ``(V_hat, s_hat)``, from its
+    preprocessed matrix under `rotate_method`, chosen once before the loop.
+    """
+    # look up the LAPACK SVD routine once for every iteration
+    gesdd = class_functions._bind_gesdd(*(a for a in (X, Y) if a is not None))
+    # transpose of U used by the rotations, made contiguous once
+    Ut = np.ascontiguousarray(U.T)
+
+    if rotate_method == 0:
+
+        def boot_body(permuted):
+            # run SVD on mean-centred, resampled matrix; the latents are
+            # computed from the resampled X, so LAPACK may overwrite it.
+            # The vectors are not aligned with V, so each keeps the sign
+            # gesdd returns; for rank-deficient resamples (e.g. mctype 2)
+            # that can differ from np.linalg.svd and so move the standard
+            # errors, while the singular values are unchanged
+            U_hat, s_hat, V_hat = class_functions._run_gesdd(
+                gesdd, permuted, overwrite_a=True
+            )
+            return (V_hat, s_hat)
+
+    elif rotate_method == 1:
+
+        def boot_body(permuted):
+            # procustes; unlike the permutation test, the rotation is
+            # built from the untransposed Vh of Ut @ U_hat, so it depends
+            # on the basis both SVDs return, including the arbitrary one
+            # for the null space left by mean-centring. Both use
+            # np.linalg.svd, as originally; gesdd returns different bases
+            # and moves the standard errors
+            U_hat, s_hat, Vh_hat = np.linalg.svd(permuted, full_matrices=False)
+            V_hat = Vh_hat.T
+            U_bar, s_bar, V_bar = np.linalg.svd(
+                Ut @ U_hat, full_matrices=False
+            )
+            rot = V_bar @ U_bar.T
+            U_rot = (U_hat * s_hat) @ rot
+            permuted_rot = U_rot @ permuted
+            s_rot = np.sqrt(np.einsum("ij,ij->i", permuted_rot, permuted_rot))
+            return (V_hat, s_rot)
+
+    elif rotate_method == 2:
+
+        def boot_body(permuted):
+            # use derivation equations to compute permuted singular values;
+            # projecting permuted.T gives the scaled right singular vectors
+            # in the (C-contiguous) layout of V rather than a transpose
+            VS_hat = permuted.T @ U
+            s_hat = np.sqrt(np.einsum("ij,ij->j", VS_hat, VS_hat))
+            # only V_hat and s_hat feed the bootstrap estimates, so the
+            # derived U_hat (permuted @ V_hat / s_hat) is not formed
+            V_hat = VS_hat / s_hat
+            return (V_hat, s_hat)
+
+    else:
+        raise exceptions.NotImplementedError(
+            f"Specified rotation method ({rotate_method}) "
+            "has not been implemented."
+        )
+    return boot_body
+
+
+def _sem_from_sums(total, total_sq, n):
+    """Element-wise standard error of the mean (as `scipy.stats.sem`) of
+    `n` samples, given their sum `total` and sum of squares `total_sq`.
+    """
+    var = (total_sq - total * total / n) / (n - 1)
+    return np.sqrt(np.maximum(var, 0) / n)
+
+
+def _use_gpu(device, X, Y, rotate_method, mctype):
+    """Checks whether a resampling test can run on the GPU for the given
+    `device`, warning and falling back to the CPU when "cuda" was asked
+    for but can't be used. "auto" picks the GPU silently, and only when
+    `X` is large enough that the SVDs (compute-bound) rather than the
+    gathers and transfers (memory-bound) dominate each iteration.
+    """
+    if device == "cpu":
+        return False
+    supported = Y is None and rotate_method == 0 and mctype != 3
+    if device == "auto":
+        return cupy is not None and supported and min(X.shape) >= _GPU_MIN_DIM
+    if cupy is None:
+        warnings.warn("CuPy is not installed; running on the CPU instead.")
+        return False
+    if not supported:
+        warnings.warn(
+            "GPU resampling only supports task PLS with rotate_method 0 "
+            "and mctype 0-2; running on the CPU instead."
+        )
+        return False
+    return True
+
+
+def _gpu_batch_size(X, niter):
+    """Number of resampled copies of `X` to process per batch on the GPU,
+    keeping each batch (and its SVD workspace) within half of the free
+    device memory.
+    """
+    free_bytes = cupy.cuda.Device().mem_info[0]
+    per_iter = 4 * X.nbytes
+    return int(max(1, min(niter, free_bytes // 2 // per_iter)))
+
+
+def _permutation_iters_gpu(
+    niter,
+    rng,
+    X,
+    Y,
+    U,
+    s,
+    V,
+    cond_order,
+    pls_alg,
+    preprocess,
+    contrast,
+    rotate_method,
+    mctype,
+    threshold,
+    verbose=True,
+):
+    """GPU version of `_permutation_iters` for task PLS with
+    `rotate_method` 0. `X` is copied to the device once; each batch of
+    permuted matrices is then gathered, mean-centred and passed to a
+    single batched SVD call that only computes singular values. Returns
+    the same values as `_permutation_iters`.
+    """
+    # indices are drawn on the host from the same stream as the CPU path
+    indices = resample.resample_without_replacement_indices(
+        X.shape[0], cond_order, niter, rng=rng
+    )
+    # centring matrix as in _bootstrap_iters_gpu
+    P_gpu = None
+    if mctype != 2:
+        P = class_functions._mean_centre_map(cond_order, mctype, dtype=X.dtype)
+        P_gpu = cupy.asarray(P)
+    Ct_gpu = None if contrast is None else cupy.asarray(contrast.T)
+
+    X_gpu = cupy.asarray(X)
+    s_list = np.empty((niter, s.shape[0]))
+    sum_perm = np.empty(niter)
+
+    batch_size = _gpu_batch_size(X, niter)
+    for start in _progress(niter, verbose, batch_size):
+        stop = min(start + batch_size, niter)
+
+        # (batch, rows, cols) stack of permuted, mean-centred matrices
+        X_new = X_gpu[cupy.asarray(indices[start:stop])]
+        if P_gpu is None:
+            permuted = X_new - X_new.mean(axis=1, keepdims=True)
+        else:
+            permuted = cupy.matmul(P_gpu, X_new)
+        sum_perm[start:stop] = cupy.asnumpy(
+            (permuted * permuted).sum(axis=(1, 2))
+        )
+
+        if Ct_gpu is not None:
+            permuted = cupy.matmul(Ct_gpu, permuted)
+        s_hat = cupy.linalg.svd(permuted, compute_uv=False)
+        s_list[start:stop] = cupy.asnumpy(s_hat)
+
+    s_list[np.abs(s_list) < threshold] = 0
+    return (s_list, sum_perm, indices)
+
+
+def _bootstrap_iters_gpu(
+    niter,
+    rng,
+    X,
+    Y,
+    U,
+    s,
+    V,
+    cond_order,
+    pls_alg,
+    preprocess,
+    rotate_method,
+    mctype,
+    verbose=True,
+):
+    """GPU version of `_bootstrap_iters` for task PLS with
+    `rotate_method` 0. `X` is copied to the device once; each batch of
+    resampled matrices is then gathered, mean-centred and decomposed with
+    a single batched SVD call. Returns the same values as
+    `_bootstrap_iters`.
+    """
+    indices = resample.resample_with_replacement_indices(
+        X.shape[0], cond_order, niter, rng=rng
+    )
+    # mean-centring is linear in the rows of its input, so group/condition
+    # centring is a fixed matrix applied to any resampled X; batches are
+    # then centred with one matmul. Grand-mean centring keeps every row,
+    # so it is broadcast instead of forming the m x m centring matrix.
+    P_gpu = None
+    if mctype != 2:
+        P = class_functions._mean_centre_map(cond_order, mctype, dtype=X.dtype)
+        P_gpu = cupy.asarray(P)
+
+    X_gpu = cupy.asarray(X)
+    left_sv_sampled = np.empty((niter, X.shape[0], U.shape[1]))
+    # the batched SVD returns V_hat transposed, so keep the running sums
+    # in that (components, features) layout and transpose them once at
+    # the end rather than operating on strided views every batch
+    right_shift = cupy.asarray(np.ascontiguousarray((V * s).T))
+    right_sum = cupy.zeros(right_shift.shape)
+    right_sq = cupy.zeros(right_shift.shape)
+
+    batch_size = _gpu_batch_size(X, niter)
+    for start in _progress(niter, verbose, batch_size):
+        stop = min(start + batch_size, niter)
+
+        # (batch, rows, cols) stack of resampled, mean-centred matrices
+        X_new = X_gpu[cupy.asarray(indices[start:stop])]
+        if P_gpu is None:
+            permuted = X_new - X_new.mean(axis=1, keepdims=True)
+        else:
+            permuted = cupy.matmul(P_gpu, X_new)
+
+        _, s_hat, Vt_hat = cupy.linalg.svd(permuted, full_matrices=False)
+
+        left_sv_sampled[start:stop] = cupy.asnumpy(
+            cupy.matmul(X_new, Vt_hat.transpose(0, 2, 1))
+        )
+        right_dev = Vt_hat * s_hat[:, :, np.newaxis] - right_shift
+        right_sum += right_dev.sum(axis=0)
+        right_sq += (right_dev * right_dev).sum(axis=0)
+
+    return (
+        left_sv_sampled,
+        cupy.asnumpy(right_sum).T[np.newaxis],
+        cupy.asnumpy(right_sq).T[np.newaxis],
+        None,
+        indices,
+    )
@@ -1,10 +1,14 @@
 import numpy as np
+import scipy.linalg
 import scipy.stats
 
 from . import exceptions, gsvd
 
+# approximate number of bytes of `X` centred per block in `_centre_rows`
+_TILE_BYTES = 1 << 20
 
-def _mean_centre(X, cond_order, mctype=0, return_means=True):
+
+def _mean_centre(X, cond_order, mctype=0, return_means=True, out=None):
     """Mean-centring method to use on `X`. Generates `X_means` and
     `X_mc` for use with `run_pls`.
 
@@ -29,6 +33,10 @@ def _mean_centre(X, cond_order, mctype=0, return_means=True):
     return_means : boolean, optional
         Optionally specify whether or not to return the means along
         with the mean-centred matrix.
+    out : np.array, optional
+        Array (e.g. an `np.memmap`) to write the mean-centred matrix into
+        when it has the same shape as `X` (mctype 2). Filled one block of
+        rows at a time so only a block is held in memory.
 
     Returns
     -------
@@ -40,7 +48,7 @@ def _mean_centre(X, cond_order, mctype=0, return_means=True):
 
     """
 
-    ngrps = cond_order.shape[0]
+    ngrps, ncond = cond_order.shape
 
     # just grab first number of conditions from cond_order
     # assumes there are the same number of subjects in each condition
@@ -48,43 +56,52 @@ def _mean_centre(X, cond_order, mctype=0, return_means=True):
     # within each group remove group means from condition means
     if mctype == 0:
         X_means = _get_group_condition_means(X, cond_order)
-        group_means = _get_group_means(X, cond_order)
+        group_means = _get_group_means_from_condition_means(
+            X_means, cond_order
+        )
 
-        repeats = np.array([len(i) for i in cond_order])
         # subtract condition-wise means from condition grand means
-        # (within group)
-        X_mc = X_means - np.repeat(group_means, repeats, axis=0)
+        # (within group); broadcast group means over each group's
+        # conditions instead of materializing repeated copies
+        X_mc = (
+            X_means.reshape(ngrps, ncond, -1) - group_means[:, np.newaxis, :]
+        ).reshape(X_means.shape)
         # X_mc /= np.linalg.norm(X_mc)
 
     # remove grand condition means from each group condition mean
     elif mctype == 1:
         X_means = _get_group_condition_means(X, cond_order)
-        grand_cond_means = _get_grand_condition_means(X, cond_order)
+        # grand condition means are the means of the group condition
+        # means, so reuse them rather than re-reading X
+        grand_cond_means = np.mean(X_means.reshape(ngrps, ncond, -1), axis=0)
 
-        # tile condition means so it's applied to both groups of X_means
-        gcm_tiled = np.tile(A=grand_cond_means, reps=(ngrps, 1))
-
-        X_mc = X_means - gcm_tiled
+        # broadcast condition means so they're applied to all groups
+        # of X_means
+        X_mc = (
+            X_means.reshape(ngrps, ncond, -1) - grand_cond_means[np.newaxis]
+        ).reshape(X_means.shape)
 
     # remove grand mean (over all subjects and conditions)
     elif mctype == 2:
         X_means = np.mean(X, axis=0)
-        X_mc = X - X_means
+        X_mc = _centre_rows(X, X_means, out=out)
 
     # remove all main effects
     # subtract condition and group means (group by condition)
     elif mctype == 3:
         X_means = _get_group_condition_means(X, cond_order)
-        group_means = _get_group_means(X, cond_order)
-
-        group_repeats = np.array([sum(i) for i in cond_order])
-        gm_repeats = np.repeat(group_means, group_repeats[0], axis=0)
-
-        # duplicate X_means so it applies to both groups
-        # x_repeats = np.tile(A=X_means, reps=(ngrps, 1))
-        x_repeats = np.repeat(X_means, ngrps * nsub_per_cond, axis=0)
+        group_means = _get_group_means_from_condition_means(
+            X_means, cond_order
+        )
 
-        X_mc = X - x_repeats - gm_repeats
+        # subtract each block's condition mean and its group's mean by
+        # broadcasting over a (groups, conditions, subjects) view of X
+        # rather than repeating the means out to the size of X
+        X_mc = (
+            X.reshape(ngrps, ncond, nsub_per_cond, -1)
+            - X_means.reshape(ngrps, ncond, 1, -1)
+            - group_means[:, np.newaxis, np.newaxis, :]
+        ).reshape(X.shape)
     else:
         raise exceptions.NotImplementedError(
             "Specified mean-centring method is either not implemented "
@@ -97,17 +114,67 @@ def _mean_centre(X, cond_order, mctype=0, return_means=True):
         return X_mc
 
 
-def _run_pls(M):
+def _mean_centre_map(cond_order, mctype=0, dtype=np.float64):
+    """Matrix mapping the rows of any `X` to its mean-centred form, so
+    that ``_mean_centre_map(cond_order, mctype) @ X`` equals
+    ``_mean_centre(X, cond_order, mctype, return_means=False)`` for the
+    group/condition mean-centring types (mctype 0 or 1).
+
+    Built directly from `cond_order`, with one row per group condition,
+    rather than by mean-centring an identity the size of `X`.
+
+    Parameters
+    ----------
+    cond_order: array-like
+        List/array where each entry holds the number of subjects per
+        condition for each group in the input matrix.
+    mctype : int, optional
+        Mean-centring method, 0 or 1, as in `_mean_centre`.
+    dtype : np.dtype, optional
+        Floating-point type of the map. Defaults to np.float64.
+
+    Returns
+    -------
+    P : np.array
+        Mean-centring map of shape (groups * conditions, subjects).
+    """
+    cond_order = np.asarray(cond_order)
+    ngrps, ncond = cond_order.shape
+    block_sizes = cond_order.reshape(-1)
+    nsub = np.sum(block_sizes)
+    block = np.repeat(np.arange(block_sizes.size), block_sizes)
+
+    # block-averaging rows: the group condition means of X are P @ X
+    P = np.zeros((block_sizes.size, nsub), dtype=dtype)
+    P[block, np.arange(nsub)] = 1 / block_sizes[block]
+    # then centre them as _mean_centre centres the means of X
+    if mctype == 0:
+        group_means = _get_group_means_from_condition_means(P, cond_order)
+        offsets = group_means[:, np.newaxis, :]
+    elif mctype == 1:
+        offsets = np.mean(P.reshape(ngrps, ncond, -1), axis=0)
+    else:
+        raise exceptions.NotImplementedError(
+            "Mean-centring maps are only implemented for mctype 0 and 1."
+        )
+    return (P.reshape(ngrps, ncond, -1) - offsets).reshape(P.shape)
+
+
+def _run_pls(M, compute_uv=True):
     """Runs and returns results of Generalized SVD on `mc`,
     mean-centred input matrix `X`.
 
     Mostly just a wrapper for gsvd.gsvd right now, but may integrate
-    other features in the future.
+    other features in the future. Only the economy-sized singular
+    vectors are computed.
 
     Parameters
     ----------
     M: np.array
         Input matrix for use with SVD.
+    compute_uv: boolean, optional
+        Specifies whether or not to compute and return U and V. If False,
+        only `s` is returned. Defaults to True.
 
     Returns
     -------
@@ -121,8 +188,89 @@ def _run_pls(M):
         right singular vectors.
     """
     # U, s, V = gsvd.gsvd(M, full_matrices=False)
-    U, s, V = np.linalg.svd(M, full_matrices=False)
-    return (U, s, V.T)
+    return _run_gesdd(_bind_gesdd(M), M, compute_uv=compute_uv)
+
+
+def _bind_gesdd(*arrays):
+    """Returns the LAPACK divide-and-conquer SVD routine (`?gesdd`) matching
+    the dtype of `arrays`, so resampling loops can look it up once and call
+    it directly.
+    """
+    (gesdd,) = scipy.linalg.get_lapack_funcs(("gesdd",), arrays)
+    return gesdd
+
+
+def _run_gesdd(gesdd, M, compute_uv=True, overwrite_a=False):
+    """Economy-sized SVD of `M` using a LAPACK routine returned by
+    `_bind_gesdd`, skipping the input validation of `np.linalg.svd`.
+
+    Parameters
+    ----------
+    gesdd : callable
+        LAPACK `?gesdd` routine.
+    M : np.array
+        Input matrix for use with SVD.
+    compute_uv : boolean, optional
+        Specifies whether or not to compute and return U and V. If False,
+        only `s` is returned. Defaults to True.
+    overwrite_a : boolean, optional
+        Allow LAPACK to destroy `M`. Defaults to False.
+
+    Returns
+    -------
+    U: np.array
+        Left singular vectors. Only returned if `compute_uv` is True.
+    s: np.array
+        Singular values.
+    V: np.array
+        Right singular vectors. Only returned if `compute_uv` is True.
+    """
+    # the singular values of M and M^T are the same, so hand LAPACK the
+    # Fortran-ordered view of a C-ordered M rather than have it copied
+    if not compute_uv and M.flags.c_contiguous:
+        M = M.T
+    U, s, Vt, info = gesdd(
+        M, compute_uv=compute_uv, full_matrices=False, overwrite_a=overwrite_a
+    )
+    if info > 0:
+        raise np.linalg.LinAlgError("SVD did not converge")
+    if info < 0:
+        raise ValueError(f"Illegal value in argument {-info} of gesdd")
+    if not compute_uv:
+        return s
+    return (U, s, Vt.T)
+
+
+def _gram_singular_values(M):
+    """Singular values of `M` from the eigenvalues of its smaller Gram
+    matrix (`M` @ `M`.T or `M`.T @ `M`), which is much cheaper than an SVD
+    when `M` is far from square.
+
+    Forming the Gram matrix squares the condition number of `M`, so
+    singular values below roughly sqrt(eps) times the largest one lose
+    their accuracy. Those under the usual rank tolerance,
+    max(`M`.shape) * eps times the largest singular value, are returned
+    as exact zeros; structurally zero values, such as those left by
+    mean-centring, may instead come back as noise of order sqrt(eps)
+    times the largest.
+
+    Parameters
+    ----------
+    M : np.array
+        Input matrix.
+
+    Returns
+    -------
+    s: np.array
+        Singular values of `M`, in descending order.
+    """
+    G = M @ M.T if M.shape[0] <= M.shape[1] else M.T @ M
+    w = np.linalg.eigvalsh(G)[::-1]
+    # the tolerance is on the singular values, so square it for the
+    # eigenvalues
+    tol = np.sqrt(w[0]) * max(M.shape) * np.finfo(w.dtype).eps
+    w[w < tol**2] = 0
+    return np.sqrt(w)
 
 
 def _run_pls_contrast(M, C, compute_uv=True):
@@ -148,7 +296,7 @@ def _run_pls_contrast(M, C, compute_uv=True):
 
     """
     CB = C.T @ M
-    s = np.sqrt(np.sum(np.power(CB, 2), axis=1))
+    s = np.sqrt(np.einsum("ij,ij->i", CB, CB))
 
     if compute_uv:
         V = CB.T
@@ -163,7 +311,7 @@ def _run_pls_contrast(M, C, compute_uv=True):
         return s
 
 
-def _compute_X_latents(X, EV):
+def _compute_X_latents(X, EV, out=None):
     """Computes latent values of original mxn input matrix `X`
     and corresponding nxn eigenvector `EV` by performing a dot-product.
 
@@ -173,13 +321,16 @@ def _compute_X_latents(X, EV):
         Input matrix of shape mxn.
     EV : np.array
         Corresponding eigenvector of shape nxn.
+    out : np.array, optional
+        Preallocated array to write the result into. Must be C-contiguous
+        and have the shape of the result. A new array is allocated if None.
 
     Returns
     -------
     dotp: np.array
         Computed dot-product of X and EV.
     """
-    dotp = np.dot(X, EV)
+    dotp = np.matmul(X, EV, out=out)
     return dotp
 
 
@@ -251,9 +402,6 @@ def _compute_Y_latents(Y, U, cond_order):
     """Compute latent variables per behavioural condition by breaking
     up Y and U into their corresponding blocks.
     """
-    print(f"Y shape: {Y.shape}")
-    print(f"co shape: {cond_order.shape}")
-    print(f"U shape: {U.shape}")
     Y_latent = np.empty((Y.shape[0], U.shape[1]))
     start = 0
     start_R = 0
@@ -311,6 +459,76 @@ def _mean_single_group(x, sg_cond_order):
     return meaned
 
 
+def _block_means(X, block_sizes):
+    """Computes the column-wise mean of consecutive row blocks of `X`.
+
+    All blocks are reduced in a single `np.add.reduceat` pass over `X`
+    rather than one `np.mean` call per block.
+
+    Parameters
+    ----------
+    X : np.array
+        2-dimensional input matrix whose rows are split into blocks.
+    block_sizes : array-like
+        Number of rows in each consecutive block. Flattened before use and
+        must sum to the number of rows in `X`.
+
+    Returns
+    -------
+    meaned : np.array
+        Array with one row per block, holding that block's column means.
+    """
+    block_sizes = np.asarray(block_sizes).reshape(-1)
+    starts = np.concatenate(([0], np.cumsum(block_sizes)[:-1]))
+    sums = np.add.reduceat(X, starts, axis=0)
+    # keep float32 input in float32 rather than promoting via the counts
+    meaned = np.divide(
+        sums,
+        block_sizes[:, np.newaxis],
+        dtype=np.result_type(sums.dtype, np.float32),
+    )
+    return meaned
+
+
+def _centre_rows(X, mu=None, out=None):
+    """Subtracts the row vector `mu` from each row of `X`, working through
+    `X` in blocks of rows so that, with `np.memmap` input and output, only
+    one block is resident at a time.
+
+    Centring is always done by broadcasting `mu`; the equivalent centring
+    matrix `I - (1/m)ee^T` is never formed.
+
+    Parameters
+    ----------
+    X : np.array
+        2-dimensional input matrix.
+    mu : np.array, optional
+        Vector with one entry per column of `X`. Defaults to the column
+        means of `X`.
+    out : np.array, optional
+        Array of the same shape as `X` to write the result into; may be `X`
+        itself to centre in place. Allocated if not given.
+
+    Returns
+    -------
+    out : np.array
+        `X` with `mu` subtracted from every row.
+    """
+    if mu is None:
+        mu = np.mean(X, axis=0)
+    elif np.ndim(mu) != 1 or len(mu) != X.shape[1]:
+        raise exceptions.ImproperShapeError(
+            f"Expected a vector of {X.shape[1]} column means to centre by, "
+            f"got shape {np.shape(mu)}. Centring matrices are not supported."
+        )
+    if out is None:
+        out = np.empty(X.shape, dtype=np.result_type(X, mu))
+    tile = max(1, _TILE_BYTES // max(1, X.itemsize * X.shape[1]))
+    for i in range(0, X.shape[0], tile):
+        np.subtract(X[i : i + tile], mu, out=out[i : i + tile])
+    return out
+
+
 def _get_group_means(X, cond_order):
     """Computes the mean of each group and returns them.
 
@@ -332,23 +550,42 @@ def _get_group_means(X, cond_order):
         Condition-wise mean of a single group.
     """
 
-    group_means = np.empty((len(cond_order), X.shape[-1]))
     # sum of subjects across all conditions in each group
     group_sums = np.sum(cond_order, axis=1)
-    # index tracking beginning of each group
-    start = 0
-
-    for i in range(len(cond_order)):
-        group_means[i,] = np.mean(
-            X[
-                start : start + group_sums[i],
-            ],
-            axis=0,
-        )
-        start += group_sums[i]
+    group_means = _block_means(X, group_sums)
     return group_means
 
 
+def _get_group_means_from_condition_means(grp_cond_means, cond_order):
+    """Computes the mean of each group from its condition means.
+
+    Equivalent to `_get_group_means`, but weights the already-computed
+    per-group condition means by the number of subjects in each condition
+    instead of making another pass over the full input matrix.
+
+    Parameters
+    ----------
+    grp_cond_means : np.array
+        Condition-wise mean for each group, as returned by
+        `_get_group_condition_means`.
+    cond_order : np.array
+        Condition order for all groups. Specifies the number of subjects
+        per condition in each group.
+
+    Returns
+    -------
+    group_means : np.array
+        Element-wise mean of each group.
+    """
+    weights = cond_order / np.sum(cond_order, axis=1, keepdims=True)
+    weights = weights.astype(grp_cond_means.dtype, copy=False)
+    return np.einsum(
+        "gc,gcn->gn",
+        weights,
+        grp_cond_means.reshape(*cond_order.shape, -1),
+    )
+
+
 def _get_group_condition_means(X, cond_order):
     """Computes per-group condition means.
 
@@ -370,22 +607,9 @@ def _get_group_condition_means(X, cond_order):
         Condition-wise mean for each group.
     """
 
-    grp_cond_means = np.empty((np.product(cond_order.shape), X.shape[-1]))
-    # group_means = _get_group_means(X, cond_order)
-    group_sums = np.sum(cond_order, axis=1)
-    # index counters for X_means and X, respectively
-    mc = 0
-    xc = 0
-
-    for i in range(len(cond_order)):
-        grp_cond_means[mc : mc + len(cond_order[i]),] = _mean_single_group(
-            X[
-                xc : xc + group_sums[i],
-            ],
-            cond_order[i],
-        )
-        mc += len(cond_order[i])
-        xc += group_sums[i]
+    # conditions are stored consecutively within each group, so every
+    # condition of every group is a contiguous block of rows
+    grp_cond_means = _block_means(X, cond_order)
     return grp_cond_means
 
 
@@ -432,6 +656,28 @@ def _get_grand_condition_means(X, cond_order):
     return grand_cond_means
 
 
+def _normalize_rows(M):
+    """Scales each row of `M` to unit Euclidean norm, in place.
+
+    Row norms are computed with a fused multiply-and-sum (no squared
+    temporary), then applied with a single broadcast divide rather than
+    multiplying by the inverse of a diagonal matrix of norms.
+
+    Parameters
+    ----------
+    M : np.array
+        2-dimensional float matrix to normalize. Overwritten.
+
+    Returns
+    -------
+    M : np.array
+        Input matrix with each row divided by its norm.
+    """
+    norms = np.sqrt(np.einsum("ij,ij->i", M, M))
+    M /= norms[:, np.newaxis]
+    return M
+
+
 def _create_multiblock(X, Y, cond_order, mctype=0):
     """Creates multiblock matrix from X and Y.
 
@@ -459,10 +705,10 @@ def _create_multiblock(X, Y, cond_order, mctype=0):
     """
     mc = _mean_centre(X, cond_order, mctype, return_means=False)
     # mc_norm = mc / np.linalg.norm(mc, axis=0)
-    mc_norm = (mc.T @ np.linalg.inv(np.diag(np.linalg.norm(mc, axis=1)))).T
+    mc_norm = _normalize_rows(mc)
     R = _compute_corr(X, Y, cond_order)
     # R_norm = R / np.linalg.norm(R, axis=0)
-    R_norm = (R.T @ np.linalg.inv(np.diag(np.linalg.norm(R, axis=1)))).T
+    R_norm = _normalize_rows(R)
 
     # stack mc and R
     mb = np.array([mc_norm, R_norm]).reshape(
@@ -34,26 +34,22 @@ def gsvd(A, M=None, W=None, exp=0.5, full_matrices=False, compute_uv=True):
           Eigenvectors of matrix `A`^T*`A`; right singular vectors
     """
 
-    # user_spec_m = True
-    # user_spec_w = True
-
-    A = np.array(A)
-    # if no M/W matrix specified, use identity matrix
-    if M is None or M == []:
-        M = np.identity(A.shape[0])
-        # user_spec_m = False
+    A = np.asarray(A)
+    A_in = A
+    # if no M/W matrix specified, the constraint is the identity matrix;
+    # leave it implicit so no m x m / n x n matrices are built or
+    # raised to fractional powers
+    user_spec_m = not (M is None or len(M) == 0)
+    user_spec_w = not (W is None or len(W) == 0)
     # cast to numpy array
-    else:
+    if user_spec_m:
         M = np.array(M)
-    if W is None or W == []:
-        W = np.identity(A.shape[1])
-        # user_spec_w = False
-    else:
+    if user_spec_w:
         W = np.array(W)
 
     # handle dimension mismatches of input matrices
-    M_wrong_dim = M.shape[0] != A.shape[0]
-    W_wrong_dim = W.shape[0] != A.shape[1]
+    M_wrong_dim = user_spec_m and M.shape[0] != A.shape[0]
+    W_wrong_dim = user_spec_w and W.shape[0] != A.shape[1]
     if M_wrong_dim:
         raise exceptions.InputMatrixDimensionMismatchError(
             "Dimension of M {} doesn't match"
@@ -71,31 +67,43 @@ def gsvd(A, M=None, W=None, exp=0.5, full_matrices=False, compute_uv=True):
         A = np.transpose(A)
         # swap M and W
         M, W = W, M
+        user_spec_m, user_spec_w = user_spec_w, user_spec_m
         flipped = True
 
     # shortcut to scipy function to raise matrix to non-integer power
     # save some typing
     matpow = fractional_matrix_power
 
-    # raise matrices to exponent provided
-    Mexp = matpow(M, exp)
-    Wexp = matpow(W, exp)
-    print(Wexp)
+    # create A-hat according to formula, raising matrices to exponent
+    # provided:
+    Ahat = A
+    if user_spec_m:
+        Ahat = np.matmul(matpow(M, exp), Ahat)
+    if user_spec_w:
+        Ahat = np.matmul(Ahat, matpow(W, exp))
 
-    # create A-hat according to formula:
-    Ahat = np.matmul(np.matmul(Mexp, A), Wexp)
+    # LAPACK is column-major: pass a Fortran-ordered float64 array so the
+    # wrapper doesn't make a hidden copy, and let LAPACK overwrite it
+    # unless it is the caller's array
+    Ahat = np.asfortranarray(Ahat, dtype=np.float64)
+    overwrite_a = not np.may_share_memory(Ahat, A_in)
 
     # use LAPACK call to save computation overhead
     # U,S,Vt = np.linalg.svd(Ahat)
     U, S, Vt, i = lapack.dgesdd(
-        Ahat, full_matrices=full_matrices, compute_uv=compute_uv
+        Ahat,
+        full_matrices=full_matrices,
+        compute_uv=compute_uv,
+        overwrite_a=overwrite_a,
     )
 
     if not compute_uv:
         return S
     # obtain matrices of generalized eigenvectors
-    Uhat = np.matmul(matpow(M, -exp), U)
-    Vhat = np.matmul(matpow(W, -exp), np.transpose(Vt))
+    Uhat = np.matmul(matpow(M, -exp), U) if user_spec_m else U
+    Vhat = np.transpose(Vt)
+    if user_spec_w:
+        Vhat = np.matmul(matpow(W, -exp), Vhat)
 
     # correct sign according to first entry in left eigenvector
     sign = np.sign(Uhat[0, 0])
@@ -9,10 +9,59 @@ import scipy.stats
 from . import bootstrap_permutation, class_functions, exceptions, gsvd
 
 
+def _format_attr(v):
+    """Formats a PLS result attribute for printing. Arrays larger than
+    NumPy's print threshold are summarized by shape and dtype instead of
+    being converted to a string.
+    """
+    if (
+        isinstance(v, np.ndarray)
+        and v.size > np.get_printoptions()["threshold"]
+    ):
+        return f"<ndarray shape={v.shape} dtype={v.dtype}>"
+    return str(v)
+
+
 class PLSBase(abc.ABC):
     """Abstract base class and factory for PLS. Registers and keeps track of
     different defined methods/implementations of PLS, as well as enforces use
     of base functions that all PLS implementations should use.
+
+    Every registered PLS method accepts the following optional keyword
+    arguments, in addition to its own parameters.
+
+    Parameters
+    ----------
+    n_jobs : int, optional
+        Optional value specifying the number of worker processes used to
+        run the permutation and bootstrap tests. -1 uses all available
+        cores. Defaults to 1 (run serially).
+    dtype : np.dtype, optional
+        Optional floating-point type to store and process `X` in, e.g.
+        np.float32 to halve memory use and traffic at reduced precision.
+        The permutation and bootstrap tests run in it too. Defaults to
+        None, meaning the dtype of `X` is kept.
+    perm_dtype : np.dtype, optional
+        Optional narrower floating-point type to run only the permutation
+        test in, e.g. np.float32; it only ranks permuted singular values
+        against the observed ones, while the bootstrap keeps the
+        precision of `X`. Defaults to None, meaning the dtype of `X`.
+    device : str, optional
+        Optional value specifying where to run the permutation and
+        bootstrap tests. "cuda" runs them in batches on the GPU with CuPy
+        (Mean-Centring/Contrast Task PLS with rotate_method 0 only);
+        otherwise, or if CuPy is not installed, the CPU is used. "auto"
+        uses the GPU only when it is available and both dimensions of X
+        are at least 512, where the SVDs outweigh moving data to the
+        device. Defaults to "cpu".
+    seed : int or np.random.Generator, optional
+        Optional seed for the random generator used by the permutation and
+        bootstrap tests. Defaults to None, meaning the generator is seeded
+        from NumPy's global random state (see ``np.random.seed``).
+    verbose : boolean, optional
+        Optional value specifying whether to print progress, including
+        the permutation and bootstrap iterations (as a tqdm progress bar
+        if tqdm is installed). Defaults to True.
     """
 
     # tracks registered PLSBase subclasses
@@ -41,14 +90,6 @@ class PLSBase(abc.ABC):
     def _get_cond_order(self):
         pass
 
-    @abc.abstractmethod
-    def __str__(self):
-        pass
-
-    @abc.abstractmethod
-    def __repr__(self):
-        pass
-
     # register valid decorated PLS method as a subclass of PLSBase
     @classmethod
     def _register_subclass(cls, pls_method):
@@ -58,17 +99,25 @@ class PLSBase(abc.ABC):
 
         return decorator
 
+    # return the registered PLS class for the method specified by user so
+    # callers creating many PLS objects can skip the lookup on each call
+    @classmethod
+    def _create_factory(cls, pls_method):
+        ctor = cls._subclasses.get(pls_method)
+        if ctor is None:
+            if pls_method in cls._pls_types:
+                raise exceptions.NotImplementedError(
+                    f"Specified PLS/Resample method "
+                    f"{cls._pls_types[pls_method]} has not yet been "
+                    "implemented."
+                )
+            raise ValueError(f"Invalid PLS method {pls_method}")
+        return ctor
+
     # instantiate and return valid registered PLS method specified by user
     @classmethod
     def _create(cls, pls_method, *args, **kwargs):
-        if pls_method not in cls._subclasses and pls_method in cls._pls_types:
-            raise exceptions.NotImplementedError(
-                f"Specified PLS/Resample method {cls._pls_types[pls_method]} "
-                "has not yet been implemented."
-            )
-        elif pls_method not in cls._subclasses:
-            raise ValueError(f"Invalid PLS method {pls_method}")
-        return cls._subclasses[pls_method](*args, **kwargs)
+        return cls._create_factory(pls_method)(*args, **kwargs)
 
 
 @PLSBase._register_subclass("mct")
@@ -123,6 +172,9 @@ class _MeanCentreTaskPLS(PLSBase):
 
         3 - remove all main effects - subtract condition and group means (group by condition)
 
+    n_jobs, dtype, perm_dtype, device, seed, verbose : optional
+        Options shared by every PLS method, documented on `PLSBase`.
+
 
     Attributes
     ----------
@@ -183,18 +235,24 @@ class _MeanCentreTaskPLS(PLSBase):
         num_boot: int = 1000,
         rotate_method: int = 0,
         mctype: int = 0,
+        n_jobs: int = 1,
+        dtype: np.dtype = None,
+        perm_dtype: np.dtype = None,
+        device: str = "cpu",
+        seed: int = None,
+        verbose: bool = True,
         **kwargs: str,
     ):
-        # so pylint will shut up
-        self.pls_alg = kwargs["pls_alg"]
-        for k, v in kwargs.items():
-            setattr(self, k, v)
+        self.pls_alg = kwargs.pop("pls_alg")
+        # remaining keyword arguments are kept aside rather than set as
+        # result attributes
+        self._extras = kwargs
 
         if len(X.shape) != 2:  # or len(X.shape) < 2:
             raise exceptions.ImproperShapeError(
                 "Input matrix must be 2-dimensional."
             )
-        self.X = X
+        self.X = np.ascontiguousarray(X, dtype=dtype)
 
         if Y is not None:
             raise ValueError(
@@ -238,7 +296,8 @@ class _MeanCentreTaskPLS(PLSBase):
             self.X, self.cond_order, mctype=self.mctype
         )
         self.U, self.s, self.V = class_functions._run_pls(self.X_mc)
-        print(f"X_mc shape: {self.X_mc.shape}")
+        if verbose:
+            print(f"X_mc shape: {self.X_mc.shape}")
         # self.X_latent = np.dot(self.X_mc, self.V)
         self.X_latent = class_functions._compute_X_latents(self.X_mc, self.V)
         self.resample_tests = bootstrap_permutation.ResampleTest._create(
@@ -254,8 +313,14 @@ class _MeanCentreTaskPLS(PLSBase):
             nboot=self.num_boot,
             rotate_method=rotate_method,
             mctype=self.mctype,
+            n_jobs=n_jobs,
+            device=device,
+            seed=seed,
+            verbose=verbose,
+            perm_dtype=perm_dtype,
         )
-        print("\nDone.")
+        if verbose:
+            print("\nDone.")
 
     @staticmethod
     def _get_groups_info(groups_tuple):
@@ -282,38 +347,21 @@ class _MeanCentreTaskPLS(PLSBase):
                 "X's row count. Please specify a custom cond_order field."
             )
 
-        cond_order = np.array(
-            [np.array([i] * num_conditions) for i in groups_tuple]
+        # each group's subject count, repeated once per condition
+        cond_order = np.repeat(
+            np.asarray(groups_tuple)[:, np.newaxis], num_conditions, axis=1
         )
         return cond_order
-        # cond_order = []
-        # # print(f"GT: {groups_tuple}")
-        # for i in range(len(groups_tuple)):
-        #     group_list = []
-        #     for k in range(num_conditions):
-        #         group_list.extend([k] * groups_tuple[i])
-        #         cond_order.append(group_list)
-        # return np.array(cond_order)
 
     def __repr__(self):
-        stg = ""
-        info = f"\nAlgorithm: {self._pls_types[self.pls_alg]}\n\n"
-        stg += info
-        for k, v in self.__dict__.items():
-            if k[0] != "_":
-                stg += f"\n{k}:\n\t"
-                stg += str(v).replace("\n", "\n\t")
-        return stg
-
-    def __str__(self):
-        stg = ""
-        info = f"\nAlgorithm: {self._pls_types[self.pls_alg]}\n\n"
-        stg += info
+        stg = [f"\nAlgorithm: {self._pls_types[self.pls_alg]}\n\n"]
         for k, v in self.__dict__.items():
             if k[0] != "_":
-                stg += f"\n{k}:\n\t"
-                stg += str(v).replace("\n", "\n\t")
-        return stg
+                stg.append(f"\n{k}:\n\t")
+                stg.append(_format_attr(v).replace("\n", "\n\t"))
+        return "".join(stg)
+
+    __str__ = __repr__
 
 
 @PLSBase._register_subclass("rb")
@@ -359,6 +407,9 @@ class _RegularBehaviourPLS(_MeanCentreTaskPLS):
 
         2 - compute s by derivation
 
+    n_jobs, dtype, perm_dtype, device, seed, verbose : optional
+        Options shared by every PLS method, documented on `PLSBase`.
+
 
     Attributes
     ----------
@@ -424,13 +475,16 @@ class _RegularBehaviourPLS(_MeanCentreTaskPLS):
         num_perm: int = 1000,
         num_boot: int = 1000,
         rotate_method: int = 0,
+        n_jobs: int = 1,
+        dtype: np.dtype = None,
+        perm_dtype: np.dtype = None,
+        device: str = "cpu",
+        seed: int = None,
+        verbose: bool = True,
         **kwargs,
     ):
-        # so pylint will shut up
-        self.pls_alg = kwargs["pls_alg"]
-
-        for k, v in kwargs.items():
-            setattr(self, k, v)
+        self.pls_alg = kwargs.pop("pls_alg")
+        self._extras = kwargs
 
         if Y is None:
             raise exceptions.MissingParameterError(
@@ -450,7 +504,7 @@ class _RegularBehaviourPLS(_MeanCentreTaskPLS):
             raise exceptions.ImproperShapeError(
                 "Input matrices must be 2-dimensional."
             )
-        self.X = X
+        self.X = np.ascontiguousarray(X, dtype=dtype)
         self.Y = Y
 
         self.groups_sizes, self.num_groups = self._get_groups_info(
@@ -514,8 +568,14 @@ class _RegularBehaviourPLS(_MeanCentreTaskPLS):
             nperm=self.num_perm,
             nboot=self.num_boot,
             rotate_method=rotate_method,
+            n_jobs=n_jobs,
+            device=device,
+            seed=seed,
+            verbose=verbose,
+            perm_dtype=perm_dtype,
         )
-        print("\nDone.")
+        if verbose:
+            print("\nDone.")
 
 
 @PLSBase._register_subclass("cst")
@@ -573,6 +633,8 @@ class _ContrastTaskPLS(_MeanCentreTaskPLS):
     contrasts: np.array
         contrast matrix for use in Contrast Task PLS. Used to create
         different methods of comparison.
+    n_jobs, dtype, perm_dtype, device, seed, verbose : optional
+        Options shared by every PLS method, documented on `PLSBase`.
 
 
     Attributes
@@ -641,13 +703,16 @@ class _ContrastTaskPLS(_MeanCentreTaskPLS):
         rotate_method: int = 0,
         mctype: int = 0,
         contrasts: list = None,
+        n_jobs: int = 1,
+        dtype: np.dtype = None,
+        perm_dtype: np.dtype = None,
+        device: str = "cpu",
+        seed: int = None,
+        verbose: bool = True,
         **kwargs,
     ):
-        # so pylint will shut up
-        self.pls_alg = kwargs["pls_alg"]
-
-        for k, v in kwargs.items():
-            setattr(self, k, v)
+        self.pls_alg = kwargs.pop("pls_alg")
+        self._extras = kwargs
 
         if Y is not None:
             raise ValueError(
@@ -659,7 +724,7 @@ class _ContrastTaskPLS(_MeanCentreTaskPLS):
             raise exceptions.ImproperShapeError(
                 "Input matrix must be 2-dimensional."
             )
-        self.X = X
+        self.X = np.ascontiguousarray(X, dtype=dtype)
 
         self.groups_sizes, self.num_groups = self._get_groups_info(
             groups_sizes
@@ -728,8 +793,14 @@ class _ContrastTaskPLS(_MeanCentreTaskPLS):
             rotate_method=rotate_method,
             mctype=self.mctype,
             contrast=self.contrasts,
+            n_jobs=n_jobs,
+            device=device,
+            seed=seed,
+            verbose=verbose,
+            perm_dtype=perm_dtype,
         )
-        print("\nDone.")
+        if verbose:
+            print("\nDone.")
 
 
 @PLSBase._register_subclass("csb")
@@ -778,6 +849,8 @@ class _ContrastBehaviourPLS(_ContrastTaskPLS):
     contrasts: np.array
         contrast matrix for use in Contrast Task PLS. Used to create
         different methods of comparison.
+    n_jobs, dtype, perm_dtype, device, seed, verbose : optional
+        Options shared by every PLS method, documented on `PLSBase`.
 
 
     Attributes
@@ -845,13 +918,16 @@ class _ContrastBehaviourPLS(_ContrastTaskPLS):
         num_boot: int = 1000,
         rotate_method: int = 0,
         contrasts: list = None,
+        n_jobs: int = 1,
+        dtype: np.dtype = None,
+        perm_dtype: np.dtype = None,
+        device: str = "cpu",
+        seed: int = None,
+        verbose: bool = True,
         **kwargs,
     ):
-        # so pylint will shut up
-        self.pls_alg = kwargs["pls_alg"]
-
-        for k, v in kwargs.items():
-            setattr(self, k, v)
+        self.pls_alg = kwargs.pop("pls_alg")
+        self._extras = kwargs
 
         if Y is None:
             raise exceptions.MissingParameterError(
@@ -866,7 +942,7 @@ class _ContrastBehaviourPLS(_ContrastTaskPLS):
                 "Input matrices must be 2-dimensional."
             )
 
-        self.X = X
+        self.X = np.ascontiguousarray(X, dtype=dtype)
         self.Y = Y
 
         self.groups_sizes, self.num_groups = self._get_groups_info(
@@ -901,11 +977,6 @@ class _ContrastBehaviourPLS(_ContrastTaskPLS):
 
         self.num_perm = num_perm
         self.num_boot = num_boot
-        # so pylint will shut up
-        self.pls_alg = kwargs["pls_alg"]
-        # TODO: catch extraneous keyword args
-        for k, v in kwargs.items():
-            setattr(self, k, v)
 
         class_functions._compute_R = class_functions._compute_corr
 
@@ -940,8 +1011,14 @@ class _ContrastBehaviourPLS(_ContrastTaskPLS):
             nboot=self.num_boot,
             rotate_method=rotate_method,
             contrast=self.contrasts,
+            n_jobs=n_jobs,
+            device=device,
+            seed=seed,
+            verbose=verbose,
+            perm_dtype=perm_dtype,
         )
-        print("\nDone.")
+        if verbose:
+            print("\nDone.")
 
 
 @PLSBase._register_subclass("mb")
@@ -987,6 +1064,9 @@ class _MultiblockPLS(_RegularBehaviourPLS):
 
         2 - compute s by derivation
 
+    n_jobs, dtype, perm_dtype, device, seed, verbose : optional
+        Options shared by every PLS method, documented on `PLSBase`.
+
 
     Attributes
     ----------
@@ -1051,14 +1131,16 @@ class _MultiblockPLS(_RegularBehaviourPLS):
         num_perm: int = 1000,
         num_boot: int = 1000,
         rotate_method: int = 0,
+        n_jobs: int = 1,
+        dtype: np.dtype = None,
+        perm_dtype: np.dtype = None,
+        device: str = "cpu",
+        seed: int = None,
+        verbose: bool = True,
         **kwargs,
     ):
-        # so pylint will shut up
-        self.pls_alg = kwargs["pls_alg"]
-
-        # TODO: catch extraneous keyword args
-        for k, v in kwargs.items():
-            setattr(self, k, v)
+        self.pls_alg = kwargs.pop("pls_alg")
+        self._extras = kwargs
 
         if Y is None:
             raise exceptions.MissingParameterError(
@@ -1079,7 +1161,7 @@ class _MultiblockPLS(_RegularBehaviourPLS):
                 "Input matrices must be 2-dimensional."
             )
 
-        self.X = X
+        self.X = np.ascontiguousarray(X, dtype=dtype)
         self.Y = Y
 
         self.groups_sizes, self.num_groups = self._get_groups_info(
@@ -1145,8 +1227,14 @@ class _MultiblockPLS(_RegularBehaviourPLS):
             nperm=self.num_perm,
             nboot=self.num_boot,
             rotate_method=rotate_method,
+            n_jobs=n_jobs,
+            device=device,
+            seed=seed,
+            verbose=verbose,
+            perm_dtype=perm_dtype,
         )
-        print("\nDone.")
+        if verbose:
+            print("\nDone.")
 
 
 # deregistered for now until Randy and I work out a new implementation
@@ -1193,6 +1281,9 @@ class _ContrastMultiblockPLS(_MultiblockPLS):
 
         2 - compute s by derivation
 
+    n_jobs, dtype, perm_dtype, device, seed, verbose : optional
+        Options shared by every PLS method, documented on `PLSBase`.
+
 
     Attributes
     ----------
@@ -1261,14 +1352,16 @@ class _ContrastMultiblockPLS(_MultiblockPLS):
         num_boot: int = 1000,
         rotate_method: int = 0,
         contrasts: list = None,
+        n_jobs: int = 1,
+        dtype: np.dtype = None,
+        perm_dtype: np.dtype = None,
+        device: str = "cpu",
+        seed: int = None,
+        verbose: bool = True,
         **kwargs,
     ):
-        # so pylint will shut up
-        self.pls_alg = kwargs["pls_alg"]
-
-        # TODO: catch extraneous keyword args
-        for k, v in kwargs.items():
-            setattr(self, k, v)
+        self.pls_alg = kwargs.pop("pls_alg")
+        self._extras = kwargs
 
         if Y is None:
             raise exceptions.MissingParameterError(
@@ -1283,7 +1376,7 @@ class _ContrastMultiblockPLS(_MultiblockPLS):
                 "Input matrices must be 2-dimensional."
             )
 
-        self.X = X
+        self.X = np.ascontiguousarray(X, dtype=dtype)
         self.Y = Y
 
         self.groups_sizes, self.num_groups = self._get_groups_info(
@@ -1318,11 +1411,6 @@ class _ContrastMultiblockPLS(_MultiblockPLS):
 
         self.num_perm = num_perm
         self.num_boot = num_boot
-        # so pylint will shut up
-        self.pls_alg = kwargs["pls_alg"]
-        # TODO: catch extraneous keyword args
-        for k, v in kwargs.items():
-            setattr(self, k, v)
 
         # assign functions to class
         # TODO: decide whether or not these should be applied
@@ -1339,7 +1427,8 @@ class _ContrastMultiblockPLS(_MultiblockPLS):
         self.contrasts = self.contrasts / np.linalg.norm(
             self.contrasts, axis=0
         )
-        print(self.contrasts)
+        if verbose:
+            print(self.contrasts)
 
         self.U, self.s, self.V = class_functions._run_pls_contrast(
             self.multiblock, self.contrasts
@@ -1376,5 +1465,11 @@ class _ContrastMultiblockPLS(_MultiblockPLS):
             nboot=self.num_boot,
             rotate_method=rotate_method,
             contrast=self.contrasts,
+            n_jobs=n_jobs,
+            device=device,
+            seed=seed,
+            verbose=verbose,
+            perm_dtype=perm_dtype,
         )
-        print("\nDone.")
+        if verbose:
+            print("\nDone.")
@@ -7,7 +7,13 @@ from . import exceptions
 
 
 def resample_without_replacement(
-    matrix, cond_order, C=None, group_num=0, return_indices=False
+    matrix,
+    cond_order,
+    C=None,
+    group_num=0,
+    return_indices=False,
+    out=None,
+    rng=None,
 ):
     """Resamples input matrix without replacement. This implementation
     uses condition array `C` to shuffle the rows of `matrix` within
@@ -30,6 +36,12 @@ def resample_without_replacement(
     return_indices: boolean, optional
         Whether or not to return the shuffled indices corresponding to the
         shuffle in the returned matrix. Defaults to False.
+    out : np.array, optional
+        Preallocated array of the same shape as `matrix` to write the
+        resampled matrix into, so repeated calls can reuse one buffer.
+    rng : np.random.Generator, optional
+        Random generator to draw the resampled indices from. See
+        `_get_rng`.
 
     Returns
     -------
@@ -82,49 +94,82 @@ def resample_without_replacement(
     # # shuf_indices = np.array([i for i in range(len(matrix))])
     # # np.random.shuffle(shuf_indices)
     # # resampled = matrix[shuf_indices, :]
+    shuf_indices = resample_without_replacement_indices(
+        len(matrix), cond_order, rng=rng
+    )[0]
+
+    resampled = np.take(matrix, shuf_indices, axis=0, out=out)
+    # return shuffled indices if specified
+    if return_indices:
+        return (resampled, shuf_indices)
+    return resampled
+
+    # flat = np.array(matrix).reshape(-1)
+    # resamp = np.random.permutation(flat)
+    # resampled = resamp.reshape(matrix.shape)
+    # return resampled
+
+
+def resample_without_replacement_indices(nrows, cond_order, niter=1, rng=None):
+    """Generates `niter` sets of row indices resampled without
+    replacement, as used by `resample_without_replacement`. All sets are
+    drawn at once with `np.random.Generator.permuted`, so callers running
+    many permutation iterations can generate every iteration's indices up
+    front.
+
+    Parameters
+    ----------
+    nrows : int
+        Number of rows in the matrix being resampled.
+    cond_order : array-like
+        Condition order for all groups. Specifies the number of subjects
+        per condition in each group.
+    niter : int, optional
+        Number of index sets to generate. Defaults to 1.
+    rng : np.random.Generator, optional
+        Random generator to draw the indices from. See `_get_rng`.
+
+    Returns
+    -------
+    shuf_indices : np.array
+        Array of shape (`niter`, `nrows`) where each row holds one set of
+        resampled indices.
+    """
     ncond = len(cond_order[0])
     nsub_grp = np.sum(cond_order[0])
     ngrp = len(cond_order)
     nsub_cond = int(nsub_grp / ncond)
     # generate indices list
-    inds = np.array([i for i in range(len(matrix))])
+    inds = np.arange(nrows)
     # reshape so indices are separated by group
     indsp = inds.reshape(ngrp, nsub_grp)
-    # print(f"{indsp}\n")
     # reshape so subject indices are separated by group and ordered by
     # condition
     grp_split = np.array(
         [indsp[i].reshape(ncond, nsub_cond).T for i in range(len(indsp))]
     )
-    # print(f"{grp_split}\n")
-    # print(grp_split)
     # merge both groups into one 2-d matrix
-    # if ngrp > 1:
     grp = grp_split.reshape(nsub_cond * ngrp, ncond)
-    # else:
-    #     grp = np.copy(grp_split)
-    # print(f"{grp}\n")
-    # shuffle first within subject's condition order and then
-    # between all subjects
-    shuff = np.random.permutation(np.random.permutation(grp.T).T)
-    # print(shuff)
-    # flatten
-    shuf_indices = shuff.ravel()
-
-    resampled = matrix[shuf_indices, :]
-    # return shuffled indices if specified
-    if return_indices:
-        return (resampled, shuf_indices)
-    return resampled
-
-    # flat = np.array(matrix).reshape(-1)
-    # resamp = np.random.permutation(flat)
-    # resampled = resamp.reshape(matrix.shape)
-    # return resampled
+    rng = _get_rng(rng)
+    # shuffle first within subject's condition order and then between
+    # all subjects, for every iteration at once; each row of the permuted
+    # aranges is an independent permutation
+    cols = rng.permuted(np.tile(np.arange(ncond), (niter, 1)), axis=1)
+    rows = rng.permuted(np.tile(np.arange(len(grp)), (niter, 1)), axis=1)
+    shuff = grp[rows[:, :, np.newaxis], cols[:, np.newaxis, :]]
+    # flatten each iteration
+    shuf_indices = shuff.reshape(niter, -1)
+    return shuf_indices
 
 
 def resample_with_replacement(
-    matrix, cond_order, C=None, group_num=0, return_indices=False
+    matrix,
+    cond_order,
+    C=None,
+    group_num=0,
+    return_indices=False,
+    out=None,
+    rng=None,
 ):
     """Resamples input matrix with replacement. This implementation
     uses condition array `C` to shuffle the rows of `matrix` within
@@ -147,6 +192,12 @@ def resample_with_replacement(
     return_indices: boolean, optional
         Whether or not to return the shuffled indices corresponding to the
         shuffle in the returned matrix. Defaults to False.
+    out : np.array, optional
+        Preallocated array of the same shape as `matrix` to write the
+        resampled matrix into, so repeated calls can reuse one buffer.
+    rng : np.random.Generator, optional
+        Random generator to draw the resampled indices from. See
+        `_get_rng`.
 
     Returns
     -------
@@ -203,12 +254,52 @@ def resample_with_replacement(
     # # shuf = np.array([i for i in range(len(matrix))])
     # # shuf_indices = np.random.choice(shuf, len(shuf), replace=True)
     # # resampled = matrix[shuf_indices, :]
+    shuf_indices = resample_with_replacement_indices(
+        len(matrix), cond_order, rng=rng
+    )[0]
+
+    resampled = np.take(matrix, shuf_indices, axis=0, out=out)
+
+    # return shuffled indices if specified
+    if return_indices:
+        return (resampled, shuf_indices)
+    return resampled
+
+    # flat = np.array(matrix).reshape(-1)
+    # resampled = np.random.choice(flat, size=matrix.shape, replace=True)
+    # return resampled
+
+
+def resample_with_replacement_indices(nrows, cond_order, niter=1, rng=None):
+    """Generates `niter` sets of row indices resampled with replacement,
+    as used by `resample_with_replacement`. All sets are drawn in a single
+    vectorized call, so callers running many bootstrap iterations can
+    generate every iteration's indices up front.
+
+    Parameters
+    ----------
+    nrows : int
+        Number of rows in the matrix being resampled.
+    cond_order : array-like
+        Condition order for all groups. Specifies the number of subjects
+        per condition in each group.
+    niter : int, optional
+        Number of index sets to generate. Defaults to 1.
+    rng : np.random.Generator, optional
+        Random generator to draw the indices from. See `_get_rng`.
+
+    Returns
+    -------
+    shuf_indices : np.array
+        Array of shape (`niter`, `nrows`) where each row holds one set of
+        resampled indices.
+    """
     ncond = len(cond_order[0])
     nsub_grp = np.sum(cond_order[0])
     ngrp = len(cond_order)
     nsub_cond = int(nsub_grp / ncond)
     # generate indices list
-    inds = np.array([i for i in range(len(matrix))])
+    inds = np.arange(nrows)
     # reshape so indices are separated by group
     indsp = inds.reshape(ngrp, nsub_grp)
     # reshape so subject indices are separated by group and ordered by
@@ -216,32 +307,38 @@ def resample_with_replacement(
     grp_split = np.array(
         [indsp[i].reshape(nsub_cond, ncond).T for i in range(len(indsp))]
     )
-    # print(grp_split)
     # merge both groups into one 2-d matrix
     grp = grp_split.reshape(nsub_cond * ngrp, ncond)
-    # shuffle first within subject's condition order and then
-    # between all subjects
-    shuf_cond = np.array(
-        [
-            np.random.choice(grp[i, :], len(grp[i, :]), replace=True)
-            for i in range(len(grp))
-        ]
-    )
+    # sample within each subject's conditions, with replacement, for
+    # every iteration at once
+    cols = _get_rng(rng).integers(0, ncond, size=(niter,) + grp.shape)
+    shuf_cond = np.take_along_axis(grp[np.newaxis], cols, axis=2)
+    # flatten each iteration
+    shuf_indices = shuf_cond.reshape(niter, -1)
+    return shuf_indices
 
-    # shuff = np.random.permutation(np.random.permutation(grp.T).T)
-    # flatten
-    shuf_indices = shuf_cond.ravel()
 
-    resampled = matrix[shuf_indices, :]
+def _get_rng(seed=None):
+    """Returns a `np.random.Generator` for the resampling functions.
 
-    # return shuffled indices if specified
-    if return_indices:
-        return (resampled, shuf_indices)
-    return resampled
+    Parameters
+    ----------
+    seed : None, int, np.random.SeedSequence or np.random.Generator
+        A Generator is returned as is; anything else is passed to
+        `np.random.default_rng`. If None, the Generator is seeded from
+        NumPy's global generator so results stay reproducible under
+        ``np.random.seed``.
 
-    # flat = np.array(matrix).reshape(-1)
-    # resampled = np.random.choice(flat, size=matrix.shape, replace=True)
-    # return resampled
+    Returns
+    -------
+    rng : np.random.Generator
+        Random generator to draw resampled indices from.
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    if seed is None:
+        seed = np.random.randint(np.iinfo(np.int32).max)
+    return np.random.default_rng(seed)
 
 
 def confidence_interval(matrix, conf=(0.05, 0.95)):
@@ -0,0 +1,152 @@
+import numpy as np
+import plspy
+import pytest
+import scipy.stats
+
+rand_s = np.random.RandomState(950613)
+
+
+@pytest.mark.parametrize("mctype", [0, 1])
+def test_permutation_iters_derived_matches_loop(mctype):
+    X = rand_s.rand(60, 40)
+    cond_order = np.array([[10, 10, 10], [10, 10, 10]])
+    mc = plspy.class_functions._mean_centre(
+        X, cond_order, mctype=mctype, return_means=False
+    )
+    U, s, V = plspy.class_functions._run_pls(mc)
+    args = (X, None, U, s, V, cond_order, "mct")
+    args += (plspy.class_functions._mean_centre, None, 2, mctype, 1e-12)
+
+    results = []
+    for iter_fn in (
+        plspy.bootstrap_permutation._permutation_iters,
+        plspy.bootstrap_permutation._permutation_iters_derived,
+    ):
+        results.append(iter_fn(10, np.random.default_rng(42), *args))
+    for loop, batched in zip(*results):
+        assert np.allclose(loop, batched)
+
+
+@pytest.mark.parametrize("mctype", [0, 1])
+def test_bootstrap_iters_derived_matches_loop(mctype):
+    X = rand_s.rand(60, 40)
+    cond_order = np.array([[10, 10, 10], [10, 10, 10]])
+    mc = plspy.class_functions._mean_centre(
+        X, cond_order, mctype=mctype, return_means=False
+    )
+    U, s, V = plspy.class_functions._run_pls(mc)
+    args = (X, None, U, s, V, cond_order, "mct")
+    args += (plspy.class_functions._mean_centre, 2, mctype)
+
+    results = []
+    for iter_fn in (
+        plspy.bootstrap_permutation._bootstrap_iters,
+        plspy.bootstrap_permutation._bootstrap_iters_derived,
+    ):
+        results.append(iter_fn(10, np.random.default_rng(42), *args))
+    (left, right_sum, right_sq, _, inds), batched = results
+    assert np.array_equal(inds, batched[4])
+    assert np.allclose(right_sum, batched[1])
+    assert np.allclose(right_sq, batched[2])
+    # latents of the null LVs divide by a vanishing norm, so skip them
+    keep = s > 1e-12
+    assert np.allclose(left[..., keep], batched[0][..., keep])
+
+
+def test_permutation_test_keeps_input_precision():
+    X = rand_s.rand(60, 40)
+    cond_order = np.array([[10, 10, 10], [10, 10, 10]])
+    mc = plspy.class_functions._mean_centre(
+        X, cond_order, mctype=0, return_means=False
+    )
+    U, s, V = plspy.class_functions._run_pls(mc)
+    permutation_test = (
+        plspy.bootstrap_permutation._ResampleTestTaskPLS._permutation_test
+    )
+    args = (X, None, U, s, V, cond_order, 10, "mct")
+    s_lists = []
+    for dtype in (None, np.float64, np.float32):
+        _, debug = permutation_test(
+            *args,
+            preprocess=plspy.class_functions._mean_centre,
+            rng=np.random.default_rng(42),
+            dtype=dtype,
+            verbose=False,
+        )
+        s_lists.append(debug["s_list"])
+    assert np.array_equal(s_lists[0], s_lists[1])
+    assert not np.array_equal(s_lists[0], s_lists[2])
+    # null LVs only carry rounding noise, which float32 magnifies
+    keep = s > 1e-12
+    assert np.allclose(s_lists[0][:, keep], s_lists[2][:, keep], atol=1e-5)
+
+
+@pytest.mark.parametrize("mctype", [0, 2])
+def test_bootstrap_body_rotate0_matches_svd_up_to_sign(mctype):
+    X = rand_s.rand(60, 40)
+    cond_order = np.array([[10, 10, 10], [10, 10, 10]])
+    U = np.linalg.svd(
+        plspy.class_functions._mean_centre(
+            X, cond_order, mctype=mctype, return_means=False
+        ),
+        full_matrices=False,
+    )[0]
+    resample_prep = plspy.bootstrap_permutation._make_resample_and_preprocess(
+        X, None, cond_order, plspy.class_functions._mean_centre, mctype
+    )
+    boot_body = plspy.bootstrap_permutation._make_bootstrap_body(X, None, U, 0)
+    indices = plspy.resample.resample_with_replacement_indices(
+        60, cond_order, niter=5, rng=np.random.default_rng(950613)
+    )
+    for inds in indices:
+        permuted = resample_prep(inds)[2]
+        _, s, Vh = np.linalg.svd(permuted, full_matrices=False)
+        V_hat, s_hat = boot_body(permuted.copy())
+        assert np.allclose(s_hat, s)
+        # only the signs of the singular vectors may differ
+        keep = s > s[0] * 1e-10
+        assert np.allclose(np.abs(V_hat[:, keep]), np.abs(Vh.T[:, keep]))
+
+
+@pytest.mark.parametrize(
+    "pls_alg, mctype", [("mct", 0), ("mct", 1), ("rb", 0)]
+)
+def test_bootstrap_rotate1_std_errs_match_baseline(pls_alg, mctype):
+    X = rand_s.rand(60, 40)
+    cond_order = np.array([[10, 10, 10], [10, 10, 10]])
+    if pls_alg == "rb":
+        Y = rand_s.rand(60, 2)
+        preprocess = plspy.class_functions._compute_corr
+        mc = preprocess(X, Y, cond_order)
+    else:
+        Y = None
+        preprocess = plspy.class_functions._mean_centre
+        mc = preprocess(X, cond_order, mctype=mctype, return_means=False)
+    U, s, V = plspy.class_functions._run_pls(mc)
+    args = (X, Y, U, s, V, cond_order, pls_alg, preprocess, 1, mctype)
+    _, right_sum, right_sq, _, indices = (
+        plspy.bootstrap_permutation._bootstrap_iters(
+            20, np.random.default_rng(950613), *args, verbose=False
+        )
+    )
+    std_errs = plspy.bootstrap_permutation._sem_from_sums(
+        right_sum.sum(axis=0), right_sq.sum(axis=0), 20
+    )
+
+    # the original loop: np.linalg.svd for both decompositions and the
+    # Procrustes rotation built from the untransposed Vh
+    right_sv_sampled = []
+    for inds in indices:
+        if Y is None:
+            permuted = preprocess(
+                X[inds], cond_order, mctype=mctype, return_means=False
+            )
+        else:
+            permuted = preprocess(X[inds], Y[inds], cond_order)
+        U_hat, s_hat, V_hat = np.linalg.svd(permuted, full_matrices=False)
+        U_bar, _, V_bar = np.linalg.svd(U.T @ U_hat, full_matrices=False)
+        permuted_rot = (U_hat * s_hat) @ (V_bar @ U_bar.T) @ permuted
+        s_rot = np.sqrt(np.sum(permuted_rot**2, axis=1))
+        right_sv_sampled.append(V_hat.T * s_rot)
+    expected = scipy.stats.sem(np.array(right_sv_sampled), axis=0)
+    assert np.allclose(std_errs, expected)
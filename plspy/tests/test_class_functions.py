@@ -23,3 +23,86 @@ def test_mean_centre():
         X, cond_order, mctype=2, return_means=False
     )
     assert res.shape == (50, 100)
+
+
+def test_mean_centre_values():
+    X = rand_s.rand(50, 100)
+    cond_order = np.array([[5, 5]] * 5)
+    X_means = plspy.class_functions._get_group_condition_means(X, cond_order)
+    group_means = plspy.class_functions._get_group_means(X, cond_order)
+    res = plspy.class_functions._mean_centre(
+        X, cond_order, mctype=0, return_means=False
+    )
+    assert np.allclose(res, X_means - np.repeat(group_means, 2, axis=0))
+
+    grand_cond_means = plspy.class_functions._get_grand_condition_means(
+        X, cond_order
+    )
+    res = plspy.class_functions._mean_centre(
+        X, cond_order, mctype=1, return_means=False
+    )
+    assert np.allclose(res, X_means - np.tile(grand_cond_means, (5, 1)))
+
+
+def test_group_means_from_condition_means():
+    X = rand_s.rand(60, 20)
+    cond_order = np.array([[4, 4, 4], [8, 8, 8]])
+    X_means = plspy.class_functions._get_group_condition_means(X, cond_order)
+    res = plspy.class_functions._get_group_means_from_condition_means(
+        X_means, cond_order
+    )
+    assert np.allclose(
+        res, plspy.class_functions._get_group_means(X, cond_order)
+    )
+
+
+def test_mean_centre_out(tmp_path):
+    X = rand_s.rand(50, 100)
+    cond_order = np.array([[5, 5]] * 5)
+    out = np.memmap(
+        tmp_path / "X_mc.dat", dtype=X.dtype, mode="w+", shape=X.shape
+    )
+    res = plspy.class_functions._mean_centre(
+        X, cond_order, mctype=2, return_means=False, out=out
+    )
+    assert res is out
+    assert np.allclose(res, X - X.mean(axis=0))
+
+
+def test_gram_singular_values():
+    X = rand_s.rand(50, 100)
+    cond_order = np.array([[5, 5]] * 5)
+    mc = plspy.class_functions._mean_centre(
+        X, cond_order, mctype=0, return_means=False
+    )
+    s = np.linalg.svd(mc, compute_uv=False)
+    for M in (mc, mc.T):
+        res = plspy.class_functions._gram_singular_values(M)
+        # within-group centring leaves a zero singular value per group,
+        # which the Gram matrix only resolves to about sqrt(eps)
+        assert np.allclose(res[:-5], s[:-5])
+        assert np.all(res[-5:] < s[0] * 1e-6)
+
+
+def test_gram_singular_values_float32():
+    Q1, _ = np.linalg.qr(rand_s.randn(10, 10))
+    Q2, _ = np.linalg.qr(rand_s.randn(2000, 10))
+    s = np.array([1, 0.8, 0.6, 0.5, 0.4, 0.3, 0.2, 0.1, 0.05, 0.01])
+    M = ((Q1 * s) @ Q2.T).astype(np.float32)
+    # small but above the rank tolerance, so it must not be zeroed
+    res = plspy.class_functions._gram_singular_values(M)
+    assert np.allclose(res, s, rtol=1e-3)
+
+
+def test_mean_centre_map():
+    X = rand_s.rand(36, 20)
+    cond_order = np.array([[4, 4, 4], [8, 8, 8]])
+    for mctype in (0, 1):
+        P = plspy.class_functions._mean_centre_map(cond_order, mctype)
+        assert P.shape == (6, 36)
+        assert np.allclose(
+            P @ X,
+            plspy.class_functions._mean_centre(
+                X, cond_order, mctype=mctype, return_means=False
+            ),
+        )
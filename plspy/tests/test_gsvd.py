@@ -0,0 +1,21 @@
+import numpy as np
+import plspy
+import pytest
+
+rand_s = np.random.RandomState(950613)
+
+
+@pytest.mark.parametrize("shape", [(20, 7), (7, 20)])
+def test_gsvd_reconstruct(shape):
+    A = rand_s.rand(*shape)
+    U, s, V = plspy.gsvd.gsvd(A)
+    assert np.allclose((U * s) @ V.T, A)
+    assert np.allclose(plspy.gsvd.gsvd(A, compute_uv=False), s)
+
+    # constrained decomposition: U^T M U = I and V^T W V = I
+    M = np.diag(rand_s.rand(shape[0]) + 1)
+    W = np.diag(rand_s.rand(shape[1]) + 1)
+    U, s, V = plspy.gsvd.gsvd(A, M=M, W=W)
+    assert np.allclose((U * s) @ V.T, A)
+    assert np.allclose(U.T @ M @ U, np.identity(len(s)))
+    assert np.allclose(V.T @ W @ V, np.identity(len(s)))
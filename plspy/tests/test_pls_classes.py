@@ -0,0 +1,137 @@
+import warnings
+
+import numpy as np
+import plspy
+import pytest
+
+rand_s = np.random.RandomState(950613)
+
+
+def test_get_cond_order():
+    cond_order = plspy.pls_classes._MeanCentreTaskPLS._get_cond_order(
+        (30, 3), (7, 3), 3
+    )
+    assert np.array_equal(cond_order, np.array([[7, 7, 7], [3, 3, 3]]))
+
+
+def test_resample_n_jobs_reproducible():
+    X = rand_s.rand(60, 40)
+    results = []
+    for _ in range(2):
+        np.random.seed(42)
+        res = plspy.PLS(X, (10, 10), 3, num_perm=20, num_boot=20, n_jobs=2)
+        results.append(res.resample_tests)
+    assert results[0].perm_debug_dict["s_list"].shape == (20, 6)
+    assert np.array_equal(results[0].permute_ratio, results[1].permute_ratio)
+    assert np.array_equal(results[0].std_errs, results[1].std_errs)
+
+
+def test_seed_reproducible():
+    X = rand_s.rand(60, 40)
+    results = [
+        plspy.PLS(X, (10, 10), 3, num_perm=10, num_boot=10, seed=7)
+        for _ in range(2)
+    ]
+    assert np.array_equal(
+        results[0].resample_tests.perm_debug_dict["indices"],
+        results[1].resample_tests.perm_debug_dict["indices"],
+    )
+    assert np.array_equal(
+        results[0].resample_tests.std_errs, results[1].resample_tests.std_errs
+    )
+
+
+def test_boot_ratios():
+    X = rand_s.rand(60, 40)
+    res = plspy.PLS(X, (10, 10), 3, num_perm=0, num_boot=10, seed=1)
+    std_errs = res.resample_tests.std_errs
+    boot_ratios = res.resample_tests.boot_ratios
+    assert np.all(np.isfinite(boot_ratios))
+    nz = std_errs > 0
+    assert np.allclose(boot_ratios[nz], (res.V * res.s)[nz] / std_errs[nz])
+
+
+@pytest.mark.parametrize("pls_method", ["mct", "rb"])
+def test_verbose_false_is_silent(capsys, pls_method):
+    X = rand_s.rand(60, 40)
+    Y = rand_s.rand(60, 2) if pls_method == "rb" else None
+    plspy.PLS(
+        X,
+        (10, 10),
+        3,
+        Y=Y,
+        num_perm=60,
+        num_boot=60,
+        pls_method=pls_method,
+        verbose=False,
+    )
+    assert capsys.readouterr().out == ""
+
+
+def test_float32_matches_float64():
+    X = rand_s.rand(60, 40)
+    res64 = plspy.PLS(X, (10, 10), 3, num_perm=0, num_boot=0)
+    res32 = plspy.PLS(X, (10, 10), 3, num_perm=0, num_boot=0, dtype=np.float32)
+    assert res32.X_mc.dtype == np.float32
+    assert np.allclose(res32.s, res64.s, atol=1e-5)
+
+
+def test_perm_dtype_only_affects_permutations():
+    X = rand_s.rand(60, 40)
+    res64, res32 = (
+        plspy.PLS(
+            X, (10, 10), 3, num_perm=10, num_boot=10, seed=3, perm_dtype=dt
+        ).resample_tests
+        for dt in (None, np.float32)
+    )
+    s64 = res64.perm_debug_dict["s_list"]
+    s32 = res32.perm_debug_dict["s_list"]
+    assert not np.array_equal(s32, s64)
+    assert np.allclose(s32[:, :4], s64[:, :4], atol=1e-5)
+    # the bootstrap keeps the float64 precision of X
+    assert res32.std_errs.dtype == np.float64
+    assert np.array_equal(res32.std_errs, res64.std_errs)
+
+
+def test_create_factory():
+    assert (
+        plspy.pls_classes.PLSBase._create_factory("mct")
+        is plspy.methods["mct"]
+    )
+    with pytest.raises(plspy.exceptions.NotImplementedError):
+        plspy.pls_classes.PLSBase._create_factory("cmb")
+    with pytest.raises(ValueError):
+        plspy.pls_classes.PLSBase._create_factory("xyz")
+
+
+@pytest.mark.skipif(
+    plspy.bootstrap_permutation.cupy is not None, reason="CuPy installed"
+)
+def test_gpu_falls_back_to_cpu():
+    X = rand_s.rand(60, 40)
+    with pytest.warns(UserWarning):
+        res = plspy.PLS(X, (10, 10), 3, num_perm=0, num_boot=5, device="cuda")
+    assert res.resample_tests.std_errs.shape == res.V.shape
+
+
+def test_invalid_device_raises():
+    X = rand_s.rand(60, 40)
+    # the derived rotate_method 2 permutation never checks for the GPU
+    with pytest.raises(ValueError):
+        plspy.PLS(
+            X,
+            (10, 10),
+            3,
+            num_perm=5,
+            num_boot=0,
+            rotate_method=2,
+            device="cdua",
+        )
+
+
+def test_auto_device_small_input_uses_cpu():
+    X = rand_s.rand(60, 40)
+    assert not plspy.bootstrap_permutation._use_gpu("auto", X, None, 0, 0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", UserWarning)
+        plspy.PLS(X, (10, 10), 3, num_perm=0, num_boot=5, device="auto")
@@ -0,0 +1,34 @@
+import numpy as np
+import plspy
+import pytest
+
+
+def test_resample_with_replacement_indices():
+    X = np.arange(60)[:, np.newaxis]
+    cond_order = np.array([[10, 10, 10], [10, 10, 10]])
+
+    batched = plspy.resample.resample_with_replacement_indices(
+        len(X), cond_order, niter=5, rng=np.random.default_rng(950613)
+    )
+    assert batched.shape == (5, 60)
+
+    # drawing all iterations at once matches drawing them one at a time
+    rng = np.random.default_rng(950613)
+    for i in range(5):
+        resampled, inds = plspy.resample.resample_with_replacement(
+            X, cond_order, return_indices=True, rng=rng
+        )
+        assert np.array_equal(inds, batched[i])
+        assert np.array_equal(resampled[:, 0], inds)
+
+
+def test_resample_without_replacement_indices():
+    cond_order = np.array([[10, 10, 10], [10, 10, 10]])
+    batched = plspy.resample.resample_without_replacement_indices(
+        60, cond_order, niter=5, rng=np.random.default_rng(950613)
+    )
+    assert batched.shape == (5, 60)
+    # every iteration is a permutation of the rows
+    assert np.array_equal(
+        np.sort(batched, axis=1), np.tile(np.arange(60), (5, 1))
+    )